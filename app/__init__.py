@@ -39,11 +39,26 @@ def create_app(config_name='default'):
     from app.blueprints.display import display_bp
     app.register_blueprint(display_bp)
 
+    from app.blueprints.api import api_bp
+    app.register_blueprint(api_bp)
+    # API clients get a 401 instead of a redirect to the login page
+    login_manager.blueprint_login_views['api'] = None
+
+    from app.commands import register_commands
+    register_commands(app)
+
+    # Keep the statistics rollups in step with ORM case writes (flush listener)
+    from app.utils import rollups  # noqa: F401
+
+    # Pick up cache invalidations made by other worker processes
+    from app.utils.cache import sync_court_caches
+    app.before_request(sync_court_caches)
+
     # Ensure DB tables + default admin exist (dev/prod only)
     # Avoid doing this during tests (tests manage their own DB lifecycle).
     if not app.config.get('TESTING'):
         from werkzeug.security import generate_password_hash
-        from app.models.models import User, DisplaySettings, Case
+        from app.models.models import User, DisplaySettings, case_display_fields
 
         with app.app_context():
             db.create_all()
@@ -85,7 +100,7 @@ def create_app(config_name='default'):
                     'defendant',
                     'status'
                 }
-                case_fields = [c.name for c in Case.__table__.columns if c.name != 'id']
+                case_fields = case_display_fields()
 
                 for field_name in case_fields:
                     db.session.add(
@@ -98,6 +113,9 @@ def create_app(config_name='default'):
 
                 db.session.commit()
 
+        from app.utils.cause_lists import start_cause_list_scheduler
+        start_cause_list_scheduler(app)
+
     from datetime import datetime, timezone
 
     @app.context_processor
@@ -0,0 +1,299 @@
+from datetime import datetime, timezone
+from flask import request, jsonify, url_for, Response
+from flask_login import login_required, current_user
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from app.models.models import ActivityLog, Case, CaseStatus, Court
+from app.utils.bulk_cases import create_cases, existing_case_numbers
+from app.utils.cache import invalidate_court
+from app.utils.case_index import index_cases_added
+from app.utils.exports import serialize_value
+from app.utils.keyset import SortKey, after_condition, decode_cursor, encode_cursor
+from extensions import db
+from . import api_bp
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# Everything but the owning user is exposed; id (the pagination key) and
+# c_order (the case's position in its court) are always returned
+CASE_API_FIELDS = tuple(c.name for c in Case.__table__.columns if c.name != 'user_id')
+ALWAYS_INCLUDED_FIELDS = ('id', 'c_order')
+API_CASE_ORDER = (SortKey(Case.id),)
+
+# Writable text columns of the bulk-create endpoint; c_order is always allocated
+BULK_TEXT_FIELDS = (
+    'next_session_date', 'session_result', 'case_subject', 'defendant', 'plaintiff',
+    'prosecution_number', 'police_department', 'police_case_number'
+)
+MAX_BULK_CASES = 1000
+
+# (query parameter, column, operator) of the date filters
+DATE_FILTERS = (
+    ('date', Case.case_date, '=='),
+    ('date_from', Case.case_date, '>='),
+    ('date_to', Case.case_date, '<='),
+    ('session_date', Case.session_date, '=='),
+    ('session_from', Case.session_date, '>='),
+    ('session_to', Case.session_date, '<='),
+)
+
+
+# Filters on the parts parsed from case_number (e.g. case_year=2024&serial_from=100)
+NUMBER_FILTERS = (
+    ('case_year', Case.case_year, '=='),
+    ('serial_from', Case.case_serial, '>='),
+    ('serial_to', Case.case_serial, '<='),
+)
+
+
+class ApiError(Exception):
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+@api_bp.errorhandler(ApiError)
+def handle_api_error(error):
+    return jsonify({'success': False, 'message': error.message}), error.status_code
+
+
+@api_bp.errorhandler(401)
+def handle_unauthorized(error):
+    return jsonify({'success': False, 'message': 'Authentication required'}), 401
+
+
+@api_bp.errorhandler(404)
+def handle_not_found(error):
+    return jsonify({'success': False, 'message': 'Not found'}), 404
+
+
+def _selected_fields(args):
+    requested = args.get('fields')
+    if not requested:
+        return CASE_API_FIELDS
+    names = [name.strip() for name in requested.split(',') if name.strip()]
+    unknown = [name for name in names if name not in CASE_API_FIELDS]
+    if unknown:
+        raise ApiError(f"Unknown field(s): {', '.join(unknown)}")
+    return tuple(dict.fromkeys(ALWAYS_INCLUDED_FIELDS + tuple(names)))
+
+
+def _page_size(args):
+    limit = args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+    if limit is None or limit < 1:
+        raise ApiError('limit must be a positive integer')
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def _parse_status(value):
+    # Accept the stored names (in_session) as well as the display values (in session)
+    if not isinstance(value, str):
+        raise ApiError('Invalid status value provided: expected a string.')
+    try:
+        return CaseStatus[value]
+    except KeyError:
+        pass
+    try:
+        return CaseStatus(value)
+    except ValueError:
+        raise ApiError(f'Invalid status value provided: "{value}".')
+
+
+def _filter_conditions(court_id, args):
+    conditions = [Case.court_id == court_id]
+    status = args.get('status')
+    if status:
+        conditions.append(Case.status == _parse_status(status))
+    for name, column, operator in NUMBER_FILTERS:
+        value = args.get(name)
+        if not value:
+            continue
+        try:
+            number = int(value)
+        except ValueError:
+            raise ApiError(f'{name} must be an integer')
+        if operator == '==':
+            conditions.append(column == number)
+        elif operator == '>=':
+            conditions.append(column >= number)
+        else:
+            conditions.append(column <= number)
+    for name, column, operator in DATE_FILTERS:
+        value = args.get(name)
+        if not value:
+            continue
+        try:
+            day = datetime.strptime(value, '%Y-%m-%d').date()
+        except ValueError:
+            raise ApiError(f'Invalid {name} format, expected YYYY-MM-DD')
+        if operator == '==':
+            conditions.append(column == day)
+        elif operator == '>=':
+            conditions.append(column >= day)
+        else:
+            conditions.append(column <= day)
+    return conditions
+
+
+def _parse_new_case(item):
+    """Validate one bulk-create item; returns (column dict, error message)."""
+    if not isinstance(item, dict):
+        return None, 'Each case must be an object'
+    case_number = str(item.get('case_number') or '').strip()
+    if not case_number:
+        return None, 'case_number is required'
+
+    values = {'case_number': case_number}
+    case_date = item.get('case_date')
+    try:
+        values['case_date'] = datetime.strptime(case_date, '%Y-%m-%d').date() if case_date else None
+    except (TypeError, ValueError):
+        return None, 'Invalid case_date format, expected YYYY-MM-DD'
+
+    num_sessions = item.get('num_sessions', 1)
+    if isinstance(num_sessions, bool) or not isinstance(num_sessions, int) or num_sessions < 0:
+        return None, 'num_sessions must be a non-negative integer'
+    values['num_sessions'] = num_sessions
+
+    try:
+        values['status'] = _parse_status(item['status']) if item.get('status') else CaseStatus.inactive
+    except ApiError as e:
+        return None, e.message
+
+    for name in BULK_TEXT_FIELDS:
+        value = item.get(name)
+        values[name] = str(value) if value not in (None, '') else None
+    return values, None
+
+
+def court_last_modified(court_id):
+    """Latest change to a court's cases: an edited row or a logged action (which covers deletions)."""
+    last_case_update = db.session.execute(
+        select(func.max(Case.updated_at)).where(Case.court_id == court_id)
+    ).scalar()
+    last_activity = db.session.execute(
+        select(func.max(ActivityLog.created_at)).where(ActivityLog.court_id == court_id)
+    ).scalar()
+    candidates = [value for value in (last_case_update, last_activity) if value]
+    if not candidates:
+        return None
+    # Stored as naive UTC; HTTP dates have one-second resolution
+    return max(candidates).replace(tzinfo=timezone.utc, microsecond=0)
+
+
+def _check_court_access(court_id):
+    if current_user.is_admin:
+        return
+    if current_user.court_id != court_id:
+        raise ApiError('Access denied', 403)
+
+
+@api_bp.route('/courts/<int:court_id>/cases')
+@login_required
+def court_cases(court_id):
+    _check_court_access(court_id)
+    db.get_or_404(Court, court_id)
+
+    fields = _selected_fields(request.args)
+    limit = _page_size(request.args)
+    conditions = _filter_conditions(court_id, request.args)
+
+    last_modified = court_last_modified(court_id)
+    if last_modified and request.if_modified_since and last_modified <= request.if_modified_since:
+        response = Response(status=304)
+        response.last_modified = last_modified
+        return response
+
+    # Pages follow the immutable id: c_order is renumbered when cases are
+    # deleted, which would make a cursor built from it skip rows
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            conditions.append(after_condition(API_CASE_ORDER, decode_cursor(API_CASE_ORDER, cursor)))
+        except ValueError:
+            raise ApiError('Invalid cursor')
+
+    stmt = (
+        select(*[getattr(Case, name) for name in fields])
+        .where(*conditions)
+        .order_by(*[key.order_by() for key in API_CASE_ORDER])
+        .limit(limit + 1)
+    )
+    rows = db.session.execute(stmt).mappings().all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = encode_cursor(API_CASE_ORDER, rows[-1]) if has_more else None
+    response = jsonify({
+        'court_id': court_id,
+        'count': len(rows),
+        'next_cursor': next_cursor,
+        'cases': [{name: serialize_value(row[name]) for name in fields} for row in rows]
+    })
+    if next_cursor:
+        next_args = request.args.to_dict()
+        next_args.pop('court_id', None)
+        next_args['cursor'] = next_cursor
+        next_url = url_for('api.court_cases', court_id=court_id, _external=True, **next_args)
+        response.headers['Link'] = f'<{next_url}>; rel="next"'
+    if last_modified:
+        response.last_modified = last_modified
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+    return response
+
+
+@api_bp.route('/courts/<int:court_id>/cases', methods=['POST'])
+@login_required
+def create_court_cases(court_id):
+    _check_court_access(court_id)
+    db.get_or_404(Court, court_id)
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        raise ApiError('Expected a JSON object with a "cases" list')
+    items = data.get('cases')
+    if not isinstance(items, list) or not items:
+        raise ApiError('Expected a non-empty "cases" list')
+    if len(items) > MAX_BULK_CASES:
+        raise ApiError(f'At most {MAX_BULK_CASES} cases can be created per request')
+
+    # Validate the whole batch before writing anything
+    cases, errors, seen = [], [], set()
+    for index, item in enumerate(items):
+        values, error = _parse_new_case(item)
+        if not error and values['case_number'] in seen:
+            error = f"Duplicate case_number {values['case_number']} in request"
+        if error:
+            errors.append({'index': index, 'message': error})
+            continue
+        seen.add(values['case_number'])
+        cases.append(values)
+    if errors:
+        return jsonify({'success': False, 'message': 'Validation failed', 'errors': errors}), 400
+
+    duplicates = existing_case_numbers(court_id, list(seen))
+    if duplicates:
+        return jsonify({
+            'success': False,
+            'message': 'Case numbers already exist in this court',
+            'duplicates': sorted(duplicates)
+        }), 409
+
+    try:
+        inserted = create_cases(court_id, cases, user_id=current_user.id)
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent request took one of the numbers after the duplicate check
+        db.session.rollback()
+        raise ApiError('Case numbers already exist in this court', 409)
+    index_cases_added(court_id, [(row.id, row.case_number) for row in inserted])
+    invalidate_court(court_id)
+
+    return jsonify({
+        'success': True,
+        'created': len(inserted),
+        'cases': [{'id': row.id, 'case_number': row.case_number, 'c_order': row.c_order} for row in inserted]
+    }), 201
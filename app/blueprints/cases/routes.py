@@ -1,92 +1,127 @@
-from flask import render_template, redirect, url_for, flash, request, jsonify
+from flask import render_template, redirect, url_for, flash, request, jsonify, Response, stream_with_context
 from flask_login import login_required, current_user
 from datetime import datetime, timedelta
+from collections import defaultdict
 from urllib.parse import urlparse
 from sqlalchemy import extract
+from sqlalchemy.exc import IntegrityError
 from app.models.models import Case, CaseStatus, Court, User
 from extensions import db
 from app.utils.helpers import log_activity
+from app.utils.cache import invalidate_court
+from app.utils.session_calendar import month_bounds, session_counts_for_month
+from app.utils.cause_lists import get_cause_list
+from app.utils.sequences import allocate_case_orders, close_case_order_gaps
+from app.utils.bulk_cases import delete_cases, change_case_statuses
+from app.utils.helpers import publish_display_update
+from app.utils.exports import iter_export_rows, generate_csv, generate_ndjson
+from app.utils.read_models import case_list_rows
+from app.utils.case_index import (
+    suggest_case_numbers, index_cases_added, index_cases_removed, index_case_renamed
+)
 from . import cases_bp
 
 
+def _visible_cases_query():
+    """Cases the current user sees on the cases page."""
+    if current_user.is_admin:
+        return Case.query
+    return Case.query.filter(
+        (Case.court_id == current_user.court_id) &
+        (Case.user_id == current_user.id)
+    )
+
+def _apply_list_filters(query, args):
+    """Apply the cases page filters in ``args`` to ``query``; returns (query, warnings)."""
+    sort_by = args.get('sort_by', 'all')
+    selected_date = args.get('date')
+    selected_month = args.get('month')
+    selected_year = args.get('year')
+    case_number_search = args.get('case_number')
+
+    today = datetime.now().date()
+    warnings = []
+
+    if selected_date:
+        try:
+            filter_date = datetime.strptime(selected_date, '%Y-%m-%d').date()
+            query = query.filter(Case.case_date == filter_date)
+        except ValueError:
+            warnings.append('Invalid date format')
+
+    elif selected_month:
+        try:
+            year, month = map(int, selected_month.split('-'))
+            query = query.filter(
+                extract('year', Case.case_date) == year,
+                extract('month', Case.case_date) == month
+            )
+        except ValueError:
+            warnings.append('Invalid month format')
+
+    elif selected_year:
+        try:
+            year = int(selected_year)
+            query = query.filter(extract('year', Case.case_date) == year)
+        except ValueError:
+            warnings.append('Invalid year format')
+
+    elif case_number_search:
+        query = query.filter(Case.case_number.ilike(f'%{case_number_search}%'))
+
+    elif sort_by != 'all':
+        if sort_by == 'day':
+            query = query.filter(Case.case_date == today)
+        elif sort_by == 'week':
+            week_start = today - timedelta(days=today.weekday())
+            week_end = week_start + timedelta(days=6)
+            query = query.filter(Case.case_date.between(week_start, week_end))
+        elif sort_by == 'month':
+            query = query.filter(
+                extract('year', Case.case_date) == today.year,
+                extract('month', Case.case_date) == today.month
+            )
+        elif sort_by == 'year':
+            query = query.filter(extract('year', Case.case_date) == today.year)
+
+    # Year of the case number itself (e.g. all */2024 cases), combinable with the above
+    case_year = args.get('case_year')
+    if case_year:
+        try:
+            query = query.filter(Case.case_year == int(case_year))
+        except ValueError:
+            warnings.append('Invalid case year format')
+
+    return query, warnings
+
+def _list_order(args):
+    """ORDER BY of the cases page: newest first, or natural case-number order with order=number."""
+    if args.get('order') == 'number':
+        return Case.natural_order()
+    return (Case.case_date.desc(), Case.c_order.asc())
+
 @cases_bp.route('/cases')
 @login_required
 def list_cases():
     try:
-        sort_by = request.args.get('sort_by', 'all')
-        selected_date = request.args.get('date')
-        selected_month = request.args.get('month')
-        selected_year = request.args.get('year')
-        case_number_search = request.args.get('case_number')
-        
-        if current_user.is_admin:
-            query = Case.query.outerjoin(Court).outerjoin(User)
-
-        else:
-            if not current_user.court_id:
-                flash('No court assigned to your account.', 'danger')
-                return redirect(url_for('main.index'))
-            query = Case.query.filter(
-                (Case.court_id == current_user.court_id) & 
-                (Case.user_id == current_user.id)
-            )
+        if not current_user.is_admin and not current_user.court_id:
+            flash('No court assigned to your account.', 'danger')
+            return redirect(url_for('main.index'))
 
-        today = datetime.now().date()
-        filter_applied = False
-        
-        if selected_date:
-            try:
-                filter_date = datetime.strptime(selected_date, '%Y-%m-%d').date()
-                query = query.filter(Case.case_date == filter_date)
-                filter_applied = True
-            except ValueError:
-                flash('Invalid date format', 'warning')
-        
-        elif selected_month:
-            try:
-                year, month = map(int, selected_month.split('-'))
-                query = query.filter(
-                    extract('year', Case.case_date) == year,
-                    extract('month', Case.case_date) == month
-                )
-                filter_applied = True
-            except ValueError:
-                flash('Invalid month format', 'warning')
-        
-        elif selected_year:
-            try:
-                year = int(selected_year)
-                query = query.filter(extract('year', Case.case_date) == year)
-                filter_applied = True
-            except ValueError:
-                flash('Invalid year format', 'warning')
-        
-        elif case_number_search:
-            query = query.filter(Case.case_number.ilike(f'%{case_number_search}%'))
-            filter_applied = True
-        
-        elif not filter_applied and sort_by != 'all':
-            if sort_by == 'day':
-                query = query.filter(Case.case_date == today)
-            elif sort_by == 'week':
-                week_start = today - timedelta(days=today.weekday())
-                week_end = week_start + timedelta(days=6)
-                query = query.filter(Case.case_date.between(week_start, week_end))
-            elif sort_by == 'month':
-                query = query.filter(
-                    extract('year', Case.case_date) == today.year,
-                    extract('month', Case.case_date) == today.month
-                )
-            elif sort_by == 'year':
-                query = query.filter(extract('year', Case.case_date) == today.year)
-
-        cases = query.order_by(Case.case_date.desc(), Case.c_order.asc()).all()
+        query, warnings = _apply_list_filters(_visible_cases_query(), request.args)
+        for warning in warnings:
+            flash(warning, 'warning')
+
+        # The compact view loads its rows from cases_data and renders them client-side
+        compact_view = request.args.get('view') == 'compact'
+        cases = [] if compact_view else case_list_rows(query.order_by(*_list_order(request.args)))
         status_options = list(CaseStatus)
 
         return render_template(
             'cases.html',
             cases=cases,
-            status_options=status_options
+            status_options=status_options,
+            compact_view=compact_view
         )
     except Exception as e:
         print(f"Error fetching data for /cases: {e}")
@@ -95,6 +130,51 @@ def list_cases():
         flash("An error occurred while loading the cases page.", "danger")
         return redirect(url_for('main.index'))
 
+@cases_bp.route('/cases/data')
+@login_required
+def cases_data():
+    """Compact JSON rows of the cases page (same filters), for its virtualized table."""
+    if not current_user.is_admin and not current_user.court_id:
+        return jsonify({'success': False, 'message': 'No court assigned to your account'}), 403
+
+    query, warnings = _apply_list_filters(_visible_cases_query(), request.args)
+    if warnings:
+        return jsonify({'success': False, 'message': '; '.join(warnings)}), 400
+
+    rows = (
+        query.order_by(*_list_order(request.args))
+        .with_entities(
+            Case.id, Case.case_number, Case.next_session_date, Case.case_subject,
+            Case.plaintiff, Case.defendant, Case.status
+        )
+        .all()
+    )
+    # Positional arrays keep the payload small; the column names are sent once
+    return jsonify({
+        'success': True,
+        'columns': ['id', 'case_number', 'next_session_date', 'case_subject', 'plaintiff', 'defendant', 'status'],
+        'count': len(rows),
+        'rows': [[*row[:-1], row.status.value if row.status else None] for row in rows]
+    })
+
+@cases_bp.route('/cases/autocomplete')
+@login_required
+def autocomplete_case_numbers():
+    """Case numbers of the court starting with ``q``, served from the in-memory index."""
+    court_id = current_user.court_id
+    if current_user.is_admin:
+        court_id = request.args.get('court_id', type=int) or court_id
+    if not court_id:
+        return jsonify({'success': False, 'message': 'No court assigned to your account'}), 403
+
+    prefix = request.args.get('q', '').strip()
+    limit = min(request.args.get('limit', 10, type=int) or 10, 50)
+    suggestions = suggest_case_numbers(court_id, prefix, limit) if prefix else []
+    return jsonify({
+        'success': True,
+        'suggestions': [{'id': case_id, 'case_number': number} for case_id, number in suggestions]
+    })
+
 @cases_bp.route('/add_case', methods=['GET', 'POST'])
 @login_required
 def add_case():
@@ -107,19 +187,11 @@ def add_case():
         return redirect(url_for('auth.list_users'))
 
     if request.method == 'POST':
-        highest_order = (
-            db.session.query(db.func.max(Case.c_order))
-            .filter(Case.court_id == current_user.court_id)
-            .scalar()
-        )
-
-        next_order = 1 if highest_order is None else highest_order + 1
-
         case_number = request.form.get('case_number')
         if not case_number:
              flash('Case Number is required.', 'danger')
              return render_template('add_case.html', form_data=request.form)
-        if Case.query.filter_by(case_number=case_number).first():
+        if Case.query.filter_by(court_id=current_user.court_id, case_number=case_number).first():
              flash(f'Case Number "{case_number}" already exists.', 'danger')
              return render_template('add_case.html', form_data=request.form)
 
@@ -149,7 +221,7 @@ def add_case():
             case = Case(
                 case_number=case_number,
                 case_date=case_date,
-                c_order=next_order,
+                c_order=allocate_case_orders(current_user.court_id),
                 next_session_date=request.form.get('next_session_date') or None,
                 session_result=request.form.get('session_result'),
                 num_sessions=num_sessions,
@@ -165,6 +237,8 @@ def add_case():
             )
             db.session.add(case)
             db.session.commit()
+            index_cases_added(case.court_id, [(case.id, case.case_number)])
+            invalidate_court(case.court_id)
             
             log_activity(
                 action='Case Added',
@@ -175,6 +249,11 @@ def add_case():
             
             flash(f'Case "{case.case_number}" added successfully.', 'success')
             return redirect(url_for('cases.list_cases'))
+        except IntegrityError:
+            # Added by another request since the check above
+            db.session.rollback()
+            flash(f'Case Number "{case_number}" already exists.', 'danger')
+            return render_template('add_case.html', form_data=request.form)
         except Exception as e:
             db.session.rollback()
             flash(f'Error adding case: {str(e)}', 'danger')
@@ -195,12 +274,15 @@ def edit_case(case_id):
         return redirect(url_for('cases.list_cases'))
 
     if request.method == 'POST':
+        old_case_number = case.case_number
         new_case_number = request.form.get('case_number')
         if new_case_number != case.case_number:
              if not new_case_number:
                   flash('Case Number cannot be empty.', 'danger')
                   return render_template('edit_case.html', case=case)
-             existing = Case.query.filter(Case.case_number == new_case_number, Case.id != case_id).first()
+             existing = Case.query.filter(
+                 Case.court_id == case.court_id, Case.case_number == new_case_number, Case.id != case_id
+             ).first()
              if existing:
                   flash(f'Case Number "{new_case_number}" already exists.', 'danger')
                   return render_template('edit_case.html', case=case)
@@ -232,8 +314,14 @@ def edit_case(case_id):
 
         try:
             db.session.commit()
+            if case.case_number != old_case_number:
+                index_case_renamed(case.court_id, case.id, old_case_number, case.case_number)
+            invalidate_court(case.court_id)
             flash(f'Case "{case.case_number}" updated successfully.', 'success')
             return redirect(url_for('cases.list_cases'))
+        except IntegrityError:
+            db.session.rollback()
+            flash(f'Case Number "{new_case_number}" already exists.', 'danger')
         except Exception as e:
             db.session.rollback()
             flash(f'Error updating case: {str(e)}', 'danger')
@@ -257,20 +345,10 @@ def delete_case(case_id):
         case_number = case.case_number
 
         db.session.delete(case)
-
-        cases_to_update = (
-            Case.query.filter(
-                Case.court_id == current_user.court_id,
-                Case.c_order > deleted_order
-            )
-            .order_by(Case.c_order.asc())
-            .all()
-        )
-
-        for c in cases_to_update:
-            c.c_order -= 1
-
+        close_case_order_gaps({current_user.court_id: [deleted_order]})
         db.session.commit()
+        index_cases_removed(current_user.court_id, [(case_id, case_number)])
+        invalidate_court(current_user.court_id)
         
         log_activity(
             action='Case Deleted',
@@ -302,6 +380,7 @@ def change_status(case_id, status):
         new_status_enum = CaseStatus(status.lower().replace('_', ' '))
         case.status = new_status_enum
         db.session.commit()
+        invalidate_court(case.court_id)
         
         log_activity(
             action='Status Changed',
@@ -323,64 +402,208 @@ def change_status(case_id, status):
 
     return redirect(url_for('cases.list_cases'))
 
-@cases_bp.route('/delete_selected_cases', methods=['POST'])
+@cases_bp.route('/bulk_change_status', methods=['POST'])
 @login_required
-def delete_selected_cases():
-    case_ids_to_delete_str = request.form.getlist('selected_case_ids')
+def bulk_change_status():
+    if not current_user.is_admin and not current_user.court_id:
+        return jsonify({'success': False, 'message': 'No court assigned to your account'}), 403
 
-    if not case_ids_to_delete_str:
-        flash('No cases were selected for deletion.', 'warning')
-        return redirect(url_for('cases.list_cases'))
+    if not request.is_json:
+        return jsonify({'success': False, 'message': 'Invalid request: Content-Type must be application/json'}), 400
+
+    data = request.get_json(silent=True)
+    raw_changes = data.get('changes') if isinstance(data, dict) else None
+    if not isinstance(raw_changes, list) or not raw_changes:
+        return jsonify({'success': False, 'message': 'Invalid data format: "changes" must be a non-empty list.'}), 400
 
-    case_ids_to_delete = []
-    invalid_ids = []
-    for id_str in case_ids_to_delete_str:
+    changes = {}
+    for idx, item in enumerate(raw_changes):
         try:
-            case_ids_to_delete.append(int(id_str))
-        except ValueError:
-            invalid_ids.append(id_str)
+            changes[int(item['case_id'])] = CaseStatus(str(item['status']).lower().replace('_', ' '))
+        except (KeyError, TypeError, ValueError):
+            return jsonify({'success': False, 'message': f'Invalid change at position {idx}: {item}'}), 400
+
+    try:
+        transitions = change_case_statuses(
+            changes,
+            court_id=None if current_user.is_admin else current_user.court_id,
+            user_id=current_user.id
+        )
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error applying bulk status change: {str(e)}")
+        return jsonify({'success': False, 'message': 'A database error occurred while updating statuses.'}), 500
+
+    # One coalesced board update per affected court
+    changed_by_court = defaultdict(list)
+    for case_id, court_id, _, _ in transitions:
+        changed_by_court[court_id].append(case_id)
+    for court_id, case_ids in changed_by_court.items():
+        invalidate_court(court_id)
+        publish_display_update({"update_type": "status", "court_id": court_id, "case_ids": case_ids})
+
+    return jsonify({
+        'success': True,
+        'message': f'Updated status for {len(transitions)} case(s).',
+        'updated': [{'case_id': case_id, 'status': new_status.value} for case_id, _, _, new_status in transitions]
+    })
 
-    if invalid_ids:
-        flash(f"Invalid case IDs received: {', '.join(invalid_ids)}. Deletion aborted.", 'danger')
+@cases_bp.route('/delete_selected_cases', methods=['POST'])
+@login_required
+def delete_selected_cases():
+    if not current_user.is_admin and not current_user.court_id:
+        flash('No court assigned to your account.', 'danger')
         return redirect(url_for('cases.list_cases'))
 
-    deleted_count = 0
-    deleted_case_numbers = []
-    try:
+    if request.form.get('select_all_matching') == '1':
+        # Everything matching the filters in the query string, resolved server-side
+        query, warnings = _apply_list_filters(_visible_cases_query(), request.args)
+        if warnings:
+            flash(f"{', '.join(warnings)}. Deletion aborted.", 'danger')
+            return redirect(url_for('cases.list_cases'))
+    else:
+        case_ids_to_delete_str = request.form.getlist('selected_case_ids')
+
+        if not case_ids_to_delete_str:
+            flash('No cases were selected for deletion.', 'warning')
+            return redirect(url_for('cases.list_cases'))
+
+        case_ids_to_delete = []
+        invalid_ids = []
+        for id_str in case_ids_to_delete_str:
+            try:
+                case_ids_to_delete.append(int(id_str))
+            except ValueError:
+                invalid_ids.append(id_str)
+
+        if invalid_ids:
+            flash(f"Invalid case IDs received: {', '.join(invalid_ids)}. Deletion aborted.", 'danger')
+            return redirect(url_for('cases.list_cases'))
+
         query = Case.query.filter(Case.id.in_(case_ids_to_delete))
-        
+
         # Apply permission filters
         if not current_user.is_admin:
-            if not current_user.court_id:
-                flash('No court assigned to your account.', 'danger')
-                return redirect(url_for('cases.list_cases'))
             query = query.filter(Case.court_id == current_user.court_id)
 
-        cases_to_delete = query.all()
+    try:
+        deleted = delete_cases(query.with_entities(Case.id).statement, user_id=current_user.id)
 
-        if not cases_to_delete:
+        if not deleted:
             flash('No cases found or you do not have permission to delete them.', 'warning')
             return redirect(url_for('cases.list_cases'))
 
-        # Store case numbers for logging before deletion
-        for case in cases_to_delete:
-            deleted_case_numbers.append(case.case_number)
-            db.session.delete(case)
-            deleted_count += 1
-
         db.session.commit()
-        
-        # Log activity for bulk deletion
-        log_activity(
-            action='Bulk Case Deletion',
-            details=f'Deleted {deleted_count} case(s): {", ".join(deleted_case_numbers[:5])}{"..." if len(deleted_case_numbers) > 5 else ""}',
-            court_id=current_user.court_id
-        )
-        
-        flash(f'Successfully deleted {deleted_count} case(s).', 'success')
+        deleted_by_court = defaultdict(list)
+        for row in deleted:
+            deleted_by_court[row.court_id].append((row.id, row.case_number))
+        for court_id, rows in deleted_by_court.items():
+            index_cases_removed(court_id, rows)
+            invalidate_court(court_id)
+
+        flash(f'Successfully deleted {len(deleted)} case(s).', 'success')
 
     except Exception as e:
         db.session.rollback()
         flash(f'An error occurred during deletion: {str(e)}', 'danger')
 
     return redirect(url_for('cases.list_cases'))
+
+@cases_bp.route('/session_calendar')
+@login_required
+def session_calendar():
+    court_id = current_user.court_id
+    if current_user.is_admin:
+        court_id = request.args.get('court_id', type=int) or court_id
+    if not court_id:
+        return jsonify({'success': False, 'message': 'No court assigned to your account'}), 403
+
+    month_str = request.args.get('month')
+    today = datetime.now().date()
+    try:
+        year, month = map(int, month_str.split('-')) if month_str else (today.year, today.month)
+        first_day, last_day = month_bounds(year, month)
+    except ValueError:
+        return jsonify({'success': False, 'message': 'Invalid month format. Use YYYY-MM.'}), 400
+
+    counts = session_counts_for_month(court_id, year, month)
+    days = []
+    day = first_day
+    while day <= last_day:
+        days.append({'date': day.isoformat(), 'count': counts.get(day.isoformat(), 0)})
+        day += timedelta(days=1)
+
+    return jsonify({
+        'success': True,
+        'court_id': court_id,
+        'month': f'{year:04d}-{month:02d}',
+        'total': sum(counts.values()),
+        'days': days
+    })
+
+@cases_bp.route('/cause_list')
+@login_required
+def cause_list():
+    court_id = current_user.court_id
+    if current_user.is_admin:
+        court_id = request.args.get('court_id', type=int) or court_id
+    if not court_id:
+        flash('No court assigned to your account.', 'danger')
+        return redirect(url_for('main.index'))
+    Court.query.get_or_404(court_id)
+
+    date_str = request.args.get('date')
+    try:
+        day = datetime.strptime(date_str, '%Y-%m-%d').date() if date_str else datetime.now().date()
+    except ValueError:
+        flash('Invalid date format', 'warning')
+        return redirect(url_for('cases.list_cases'))
+
+    snapshot = get_cause_list(court_id, day, refresh=request.args.get('refresh') == '1')
+
+    output_format = request.args.get('format', 'html')
+    if output_format == 'json':
+        return Response(snapshot.payload, mimetype='application/json')
+    if output_format == 'print':
+        return Response(snapshot.print_html, mimetype='text/html')
+    return Response(snapshot.html, mimetype='text/html')
+
+@cases_bp.route('/cases/export/<string:export_format>')
+@login_required
+def export_cases(export_format):
+    generators = {
+        'csv': (generate_csv, 'text/csv; charset=utf-8'),
+        'ndjson': (generate_ndjson, 'application/x-ndjson; charset=utf-8'),
+    }
+    if export_format not in generators:
+        return jsonify({'success': False, 'message': 'Invalid export format. Use csv or ndjson.'}), 400
+
+    if not current_user.is_admin and not current_user.court_id:
+        return jsonify({'success': False, 'message': 'No court assigned to your account'}), 403
+
+    # Same filters as the cases page, plus the status/court filters of court_cases
+    query, warnings = _apply_list_filters(_visible_cases_query(), request.args)
+    if warnings:
+        return jsonify({'success': False, 'message': '; '.join(warnings)}), 400
+
+    status_filter = request.args.get('status')
+    if status_filter and status_filter != 'all':
+        try:
+            query = query.filter(Case.status == CaseStatus(status_filter))
+        except ValueError:
+            return jsonify({'success': False, 'message': f'Invalid status value provided: "{status_filter}".'}), 400
+
+    court_id = request.args.get('court_id', type=int)
+    if current_user.is_admin and court_id:
+        query = query.filter(Case.court_id == court_id)
+
+    query = query.order_by(Case.court_id.asc(), Case.c_order.asc(), Case.id.asc())
+    generate, mimetype = generators[export_format]
+    filename = f'cases_{datetime.now().strftime("%Y%m%d_%H%M%S")}.{export_format}'
+
+    return Response(
+        stream_with_context(generate(iter_export_rows(query))),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
@@ -1,16 +1,11 @@
-from flask import current_app, render_template, redirect, url_for, flash, request, jsonify
+from flask import render_template, redirect, url_for, flash, request, jsonify
 from flask_login import login_required, current_user
-from app.models.models import Case, DisplayCase, DisplaySettings, Court, CaseStatus
-from extensions import db, sse
-
-
-def _publish_display_update(payload):
-    if not current_app.config.get('SSE_ENABLED'):
-        return
-    try:
-        sse.publish(payload, type='display_update')
-    except Exception as sse_error:
-        print(f"Warning: Failed to publish SSE event: {sse_error}")
+from app.models.models import Case, DisplayCase, DisplaySettings, Court, CaseStatus, case_display_fields
+from extensions import db
+from app.utils.cache import invalidate_court
+from app.utils.dashboards import board_cases
+from app.utils.read_models import display_entry_rows
+from app.utils.helpers import publish_display_update
 from . import display_bp
 
 
@@ -25,19 +20,12 @@ def manage_display():
         flash('Please impersonate a user with court assignment to manage display.', 'info')
         return redirect(url_for('auth.list_users'))
 
-    all_cases = Case.query.filter_by(court_id=current_user.court_id).order_by(Case.case_number).all()
-
-    display_cases = DisplayCase.query.join(Case).filter(
-        Case.court_id == current_user.court_id
-    ).options(db.joinedload(DisplayCase.case)).order_by(
-        DisplayCase.custom_order.asc().nullsfirst(),
-        DisplayCase.display_order.asc()
-    ).all()
+    # Cases to add are looked up through cases.autocomplete_case_numbers
+    display_cases = display_entry_rows(current_user.court_id)
 
     displayed_case_ids = {dc.case_id for dc in display_cases}
 
     return render_template('manage_display.html',
-                           all_cases=all_cases,
                            display_cases=display_cases,
                            displayed_ids=displayed_case_ids)
 
@@ -67,7 +55,8 @@ def add_to_display(case_id):
         )
         db.session.add(display_case)
         db.session.commit()
-        _publish_display_update({"update_type": "add", "case_id": case_id})
+        invalidate_court(current_user.court_id, cause_lists=False)
+        publish_display_update({"update_type": "add", "case_id": case_id})
         flash(f'Case "{case.case_number}" added to display.', 'success')
 
 
@@ -96,7 +85,8 @@ def remove_from_display(case_id):
              dc.display_order = i + 1
 
         db.session.commit()
-        _publish_display_update({"update_type": "remove", "case_id": case_id})
+        invalidate_court(current_user.court_id, cause_lists=False)
+        publish_display_update({"update_type": "remove", "case_id": case_id})
         flash(f'Case "{case_number}" removed from display and list reordered.', 'success')
 
     else:
@@ -112,6 +102,7 @@ def update_display_order():
         return redirect(url_for('main.index'))
 
     updated_count = 0
+    changed_courts = set()
     try:
         for key, value in request.form.items():
             if key.startswith('order_'):
@@ -127,13 +118,16 @@ def update_display_order():
                     display_case = DisplayCase.query.filter_by(case_id=case_id).first()
                     if display_case and display_case.custom_order != custom_order:
                         display_case.custom_order = custom_order
+                        changed_courts.add(display_case.court_id)
                         updated_count += 1
                 except (ValueError, IndexError, TypeError):
                     flash(f'Invalid order input received: {key}={value}', 'warning')
 
         if updated_count > 0:
               db.session.commit()
-              _publish_display_update({"update_type": "order", "message": "Display order changed"})
+              for court_id in changed_courts:
+                  invalidate_court(court_id, cause_lists=False)
+              publish_display_update({"update_type": "order", "message": "Display order changed"})
               flash(f'Display order updated for {updated_count} case(s).', 'success')
 
         else:
@@ -174,7 +168,7 @@ def display_settings():
         "police_case_number": "رقم الشرطة",
         "status": "الحالة"
     }
-    case_fields = [column.name for column in Case.__table__.columns if column.name != 'id']
+    case_fields = case_display_fields()
 
     if request.method == 'POST':
         visible_field_names = request.form.getlist('visible_fields')
@@ -230,14 +224,7 @@ def general():
             return "No active courts available for display", 404
         court_id = court.id
 
-    display_entries = DisplayCase.query.join(Case).filter(
-        Case.court_id == court_id
-    ).options(db.joinedload(DisplayCase.case)).order_by(
-        DisplayCase.custom_order.asc().nullsfirst(),
-        DisplayCase.display_order.asc()
-    ).all()
-
-    cases_to_display = [dc.case for dc in display_entries if dc.case and dc.case.court_id == court_id]
+    cases_to_display = board_cases(court_id)
 
     settings = DisplaySettings.query.all()
     visible_fields = [s.field_name for s in settings if s.is_visible]
@@ -344,10 +331,11 @@ def update_display_order_ajax():
 
         if updated_count > 0:
             db.session.commit()
+            invalidate_court(current_user.court_id, cause_lists=False)
             message = f'Successfully updated order for {updated_count} case(s).'
             
             try:
-                 _publish_display_update({"update_type": "order", "message": "Display order changed"})
+                 publish_display_update({"update_type": "order", "message": "Display order changed"})
 
             except Exception as sse_error:
                  print(f"Warning: Failed to publish SSE event after order update: {sse_error}")
@@ -5,11 +5,20 @@ from datetime import datetime, timezone, timedelta
 from collections import defaultdict
 from flask import render_template, redirect, url_for, flash, request, jsonify, send_from_directory, send_file, current_app, Response
 from flask_login import login_required, current_user
+from sqlalchemy.orm import selectinload
 from werkzeug.utils import secure_filename
-from app.models.models import User, Case, CaseStatus, DisplayCase, DisplaySettings, ActivityLog, Court
+from app.models.models import User, Case, CaseStatus, DisplayCase, DisplaySettings, ActivityLog, Court, case_display_fields
 from extensions import db
 from app.utils.excel_processor import ExcelProcessor
 from app.utils.json_importer import JsonToDatabase
+from app.utils.dashboards import control_summary, dashboard_summary
+from app.utils.read_models import CASE_PAGE_SIZE, CASE_PAGE_SORTS, MAX_CASE_PAGE_SIZE, case_list_page
+from app.utils.cache import cache
+from app.utils.case_index import drop_case_index
+from app.utils.statistics import STATISTICS_PANELS, court_case_counts, statistics_panel
+from app.utils.analytics import DURATION_GROUPS, DURATION_PERCENTILES, duration_percentiles
+from app.utils.exports import REPORT_CACHE_TTL, excel_report_file
+from app.utils.single_flight import flight_key, single_flight
 from . import main_bp
 import qrcode
 
@@ -19,24 +28,19 @@ def index():
         return redirect(url_for('auth.login'))
 
     if current_user.is_admin:
-        users = User.query.all()
-        cases = Case.query.all()
-        return render_template('control.html', users=users, cases=cases)
+        return render_template('control.html', summary=control_summary())
     else:
         if not current_user.court_id:
             flash('No court assigned to your account.', 'danger')
             return redirect(url_for('auth.login'))
 
-        court_cases = Case.query.filter_by(court_id=current_user.court_id).order_by(Case.added_date.desc()).all()
-        active_cases = [case for case in court_cases if case.status == CaseStatus.active]
-        display_cases = DisplayCase.query.join(Case).filter(Case.court_id == current_user.court_id).all()
-        latest_cases = court_cases[:10]
+        summary = dashboard_summary(current_user.court_id)
 
         return render_template('user_dashboard.html', 
-                             cases=court_cases,
-                             active_cases=active_cases,
-                             display_cases=display_cases,
-                             latest_cases=latest_cases,
+                             total_cases=summary['total_cases'],
+                             active_count=summary['active_cases'],
+                             display_count=summary['display_cases'],
+                             latest_cases=summary['latest_cases'],
                              court=current_user.court)
 
 @main_bp.route('/upload', methods=['POST'])
@@ -382,8 +386,9 @@ def list_courts():
     if not current_user.is_admin:
         flash('Access denied.', 'danger')
         return redirect(url_for('main.index'))
-    courts = Court.query.all()
-    return render_template('courts.html', courts=courts)
+    # Case counts come from the status rollup; only the listed users are loaded, in one query
+    courts = Court.query.options(selectinload(Court.users)).order_by(Court.id).all()
+    return render_template('courts.html', courts=courts, case_counts=court_case_counts())
 
 @main_bp.route('/add_court', methods=['GET', 'POST'])
 @login_required
@@ -481,23 +486,20 @@ def view_court_details(court_id):
 
     court = Court.query.get_or_404(court_id)
     
-    total_cases = len(court.cases)
-    active_cases = [case for case in court.cases if case.status == CaseStatus.active]
-    inactive_cases = [case for case in court.cases if case.status == CaseStatus.inactive]
-    finished_cases = [case for case in court.cases if case.status == CaseStatus.finished]
+    counts = court_case_counts(court_id).get(court_id, {})
     
     recent_cases = Case.query.filter_by(court_id=court_id).order_by(Case.added_date.desc()).limit(10).all()
     
-    display_cases = DisplayCase.query.join(Case).filter(Case.court_id == court_id).all()
+    displayed_cases = DisplayCase.query.join(Case).filter(Case.court_id == court_id).count()
     
     return render_template('court_details.html', 
                          court=court,
-                         total_cases=total_cases,
-                         active_cases=active_cases,
-                         inactive_cases=inactive_cases,
-                         finished_cases=finished_cases,
+                         total_cases=counts.get('total', 0),
+                         active_cases=counts.get('active', 0),
+                         inactive_cases=counts.get('inactive', 0),
+                         finished_cases=counts.get('finished', 0),
                          recent_cases=recent_cases,
-                         display_cases=display_cases)
+                         displayed_cases=displayed_cases)
 
 @main_bp.route('/court_cases/<int:court_id>')
 @login_required
@@ -527,15 +529,49 @@ def court_cases(court_id):
         except ValueError:
             pass
     
-    cases = query.order_by(Case.case_date.desc(), Case.c_order.asc()).all()
+    case_year = request.args.get('case_year', type=int)
+    if case_year:
+        query = query.filter(Case.case_year == case_year)
+
+    total_cases = query.order_by(None).count()
+
+    order = request.args.get('order') or 'newest'
+    if order not in CASE_PAGE_SORTS:
+        order = 'newest'
+    per_page = max(1, min(request.args.get('per_page', CASE_PAGE_SIZE, type=int) or CASE_PAGE_SIZE, MAX_CASE_PAGE_SIZE))
+    cursor = request.args.get('cursor')
+    try:
+        cases, next_cursor = case_list_page(query, order, cursor, per_page)
+    except ValueError:
+        flash('Invalid page link; showing the first page.', 'warning')
+        cursor = None
+        cases, next_cursor = case_list_page(query, order, None, per_page)
     
+    page_args = {name: value for name, value in request.args.items() if name not in ('cursor', 'court_id')}
     return render_template('court_cases.html', 
                          court=court, 
                          cases=cases,
+                         total_cases=total_cases,
+                         next_url=url_for('main.court_cases', court_id=court_id, **page_args, cursor=next_cursor) if next_cursor else None,
+                         first_url=url_for('main.court_cases', court_id=court_id, **page_args) if cursor else None,
+                         current_order=order,
                          status_options=list(CaseStatus),
                          current_status=status_filter,
                          current_date=date_filter)
 
+def _statistics_filters(args):
+    """Parse the statistics page filters; returns ``(filters, errors)``."""
+    filters = {'court_id': args.get('court_id', type=int)}
+    errors = []
+    for name in ('start_date', 'end_date'):
+        value = args.get(name)
+        if value:
+            try:
+                filters[name] = datetime.strptime(value, '%Y-%m-%d').date()
+            except ValueError:
+                errors.append(f'Invalid {name.replace("_", " ")} format')
+    return filters, errors
+
 @main_bp.route('/statistics')
 @login_required
 def statistics():
@@ -543,171 +579,62 @@ def statistics():
         flash('Access denied. Admin privileges required.', 'danger')
         return redirect(url_for('main.index'))
     
-    start_date = request.args.get('start_date')
-    end_date = request.args.get('end_date')
-    court_id = request.args.get('court_id')
-    
-    case_query = Case.query
-    activity_query = ActivityLog.query
-    
-    if start_date:
-        try:
-            start_date_obj = datetime.strptime(start_date, '%Y-%m-%d').date()
-            case_query = case_query.filter(Case.case_date >= start_date_obj)
-            activity_query = activity_query.filter(ActivityLog.created_at >= start_date_obj)
-        except ValueError:
-            flash('Invalid start date format', 'warning')
-    
-    if end_date:
-        try:
-            end_date_obj = datetime.strptime(end_date, '%Y-%m-%d').date()
-            case_query = case_query.filter(Case.case_date <= end_date_obj)
-            activity_query = activity_query.filter(ActivityLog.created_at <= end_date_obj)
-        except ValueError:
-            flash('Invalid end date format', 'warning')
-    
-    if court_id:
-        case_query = case_query.filter(Case.court_id == court_id)
-        activity_query = activity_query.filter(ActivityLog.court_id == court_id)
-    
-    all_cases = case_query.all()
-    
-    today = datetime.now().date()
-    first_day_of_month = today.replace(day=1)
-    new_cases_this_month = Case.query.filter(
-        Case.added_date >= first_day_of_month,
-        Case.added_date <= datetime.now()
-    ).count()
-    
-    summary = {
-        'total_cases': len(all_cases),
-        'active_cases': len([c for c in all_cases if c.status == CaseStatus.in_session]),
-        'finished_cases': len([c for c in all_cases if c.status == CaseStatus.finished]),
-        'postponed_cases': len([c for c in all_cases if c.status == CaseStatus.postponed]),
-        'inactive_cases': len([c for c in all_cases if c.status == CaseStatus.inactive]),
-        'new_cases_this_month': new_cases_this_month,
-        'total_courts': Court.query.filter_by(is_active=True).count(),
-        'total_users': User.query.count()
-    }
-    
-    status_distribution = [
-        summary['active_cases'],
-        summary['inactive_cases'],
-        summary['postponed_cases'],
-        summary['finished_cases']
-    ]
-    
-    monthly_data = []
-    monthly_labels = []
-    monthly_new_cases = []
-    monthly_finished_cases = []
-    
-    for i in range(11, -1, -1):
-        month_date = today - timedelta(days=30*i)
-        month_start = month_date.replace(day=1)
-        if month_date.month == 12:
-            month_end = month_date.replace(year=month_date.year+1, month=1, day=1) - timedelta(days=1)
-        else:
-            month_end = month_date.replace(month=month_date.month+1, day=1) - timedelta(days=1)
-        
-        new_count = Case.query.filter(
-            Case.added_date >= month_start,
-            Case.added_date <= month_end
-        ).count()
-        
-        finished_count = ActivityLog.query.filter(
-            ActivityLog.action == 'Status Changed',
-            ActivityLog.details.like('%finished%'),
-            ActivityLog.created_at >= month_start,
-            ActivityLog.created_at <= month_end
-        ).count()
-        
-        monthly_labels.append(month_date.strftime('%Y-%m'))
-        monthly_new_cases.append(new_count)
-        monthly_finished_cases.append(finished_count)
+    # Only the page shell is rendered here; every panel loads from statistics_panel
+    _, errors = _statistics_filters(request.args)
+    for error in errors:
+        flash(error, 'warning')
     
     courts = Court.query.filter_by(is_active=True).all()
-    court_statistics = []
-    
-    for court in courts:
-        court_cases = [c for c in all_cases if c.court_id == court.id]
-        total = len(court_cases)
-        active = len([c for c in court_cases if c.status == CaseStatus.in_session])
-        finished = len([c for c in court_cases if c.status == CaseStatus.finished])
-        postponed = len([c for c in court_cases if c.status == CaseStatus.postponed])
-        
-        completion_rate = round((finished / total * 100), 1) if total > 0 else 0
-        
-        finished_cases_list = [c for c in court_cases if c.status == CaseStatus.finished and c.case_date]
-        avg_duration = 0
-        if finished_cases_list:
-            total_days = sum([(datetime.now().date() - c.case_date).days for c in finished_cases_list])
-            avg_duration = round(total_days / len(finished_cases_list))
-        
-        court_statistics.append({
-            'court_name': court.name,
-            'total_cases': total,
-            'active_cases': active,
-            'finished_cases': finished,
-            'postponed_cases': postponed,
-            'completion_rate': completion_rate,
-            'avg_duration': avg_duration
-        })
-    
-    users = User.query.all()
-    user_statistics = []
-    
-    for user in users:
-        user_cases = Case.query.filter_by(user_id=user.id)
-        if start_date and end_date:
-            user_cases = user_cases.filter(
-                Case.added_date >= datetime.strptime(start_date, '%Y-%m-%d'),
-                Case.added_date <= datetime.strptime(end_date, '%Y-%m-%d')
-            )
-        
-        last_activity = ActivityLog.query.filter_by(user_id=user.id).order_by(
-            ActivityLog.created_at.desc()
-        ).first()
-        
-        user_statistics.append({
-            'username': user.username,
-            'cases_added': user_cases.count(),
-            'last_activity': last_activity.created_at if last_activity else None
-        })
-    
-    recent_activities = ActivityLog.query.order_by(
-        ActivityLog.created_at.desc()
-    ).limit(10).all()
-    
-    thirty_days_ago = datetime.now() - timedelta(days=30)
-    status_changes = ActivityLog.query.filter(
-        ActivityLog.action == 'Status Changed',
-        ActivityLog.created_at >= thirty_days_ago
-    ).all()
-    
-    status_changes_by_day = {}
-    for activity in status_changes:
-        day = activity.created_at.strftime('%Y-%m-%d')
-        status_changes_by_day[day] = status_changes_by_day.get(day, 0) + 1
-    
-    status_changes_labels = list(status_changes_by_day.keys())
-    status_changes_data = list(status_changes_by_day.values())
-    
     return render_template('statistics.html',
-                         summary=summary,
-                         status_distribution=status_distribution,
-                         monthly_labels=monthly_labels,
-                         monthly_new_cases=monthly_new_cases,
-                         monthly_finished_cases=monthly_finished_cases,
-                         court_statistics=court_statistics,
-                         user_statistics=user_statistics,
-                         recent_activities=recent_activities,
-                         status_changes_labels=status_changes_labels,
-                         status_changes_data=status_changes_data,
+                         panels=list(STATISTICS_PANELS),
                          courts=courts,
-                         start_date=start_date,
-                         end_date=end_date,
-                         court_id=court_id)
+                         start_date=request.args.get('start_date'),
+                         end_date=request.args.get('end_date'),
+                         court_id=request.args.get('court_id'))
+
+@main_bp.route('/statistics/panels/<panel>')
+@login_required
+def statistics_panel_data(panel):
+    if not current_user.is_admin:
+        return jsonify({'success': False, 'message': 'Admin privileges required'}), 403
+    if panel not in STATISTICS_PANELS:
+        return jsonify({'success': False, 'message': f'Unknown panel "{panel}"'}), 404
+
+    filters, errors = _statistics_filters(request.args)
+    if errors:
+        return jsonify({'success': False, 'message': f"{', '.join(errors)}. Use YYYY-MM-DD."}), 400
+
+    started = time.perf_counter()
+    data, source = statistics_panel(panel, **filters)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    response = jsonify({'success': True, 'panel': panel, 'data': data})
+    response.headers['Server-Timing'] = f'{panel};desc="{source}";dur={elapsed_ms:.1f}'
+    response.headers['X-Cache'] = 'MISS' if source == 'computed' else 'HIT'
+    return response
+
+@main_bp.route('/statistics/durations')
+@login_required
+def statistics_durations():
+    if not current_user.is_admin:
+        return jsonify({'success': False, 'message': 'Admin privileges required'}), 403
+
+    group = request.args.get('group', 'court')
+    if group not in DURATION_GROUPS:
+        return jsonify({'success': False, 'message': f'Invalid group. Use one of: {", ".join(DURATION_GROUPS)}.'}), 400
+
+    filters, errors = _statistics_filters(request.args)
+    if errors:
+        return jsonify({'success': False, 'message': f"{', '.join(errors)}. Use YYYY-MM-DD."}), 400
+
+    limit = request.args.get('limit', 50, type=int)
+    rows = duration_percentiles(group, limit=max(1, min(limit, 500)), **filters)
+    return jsonify({
+        'success': True,
+        'group': group,
+        'percentiles': list(DURATION_PERCENTILES),
+        'rows': rows
+    })
 
 @main_bp.route('/export_report/<format>')
 @login_required
@@ -717,7 +644,7 @@ def export_report(format):
         return redirect(url_for('main.index'))
     
     if format == 'excel':
-        return export_excel_report()
+        return export_excel_report(request.args)
     elif format == 'pdf':
         flash('PDF export feature coming soon', 'info')
         return redirect(url_for('main.statistics'))
@@ -725,67 +652,47 @@ def export_report(format):
         flash('Invalid export format', 'danger')
         return redirect(url_for('main.statistics'))
 
-def export_excel_report():
+def export_excel_report(args):
+    filters, errors = _statistics_filters(args)
+    if errors:
+        for error in errors:
+            flash(error, 'warning')
+        return redirect(url_for('main.statistics'))
+
+    # Identical exports requested together (or within REPORT_CACHE_TTL) stream one report file
     try:
-        import pandas as pd
-        from io import BytesIO
-        
-        output = BytesIO()
-        
-        cases = Case.query.all()
-        activities = ActivityLog.query.order_by(ActivityLog.created_at.desc()).limit(1000).all()
-        
-        cases_data = []
-        for case in cases:
-            cases_data.append({
-                'رقم القضية': case.case_number,
-                'تاريخ القضية': case.case_date.strftime('%Y-%m-%d') if case.case_date else '',
-                'الحالة': case.status.value if case.status else '',
-                'الموضوع': case.case_subject or '',
-                'المستأنف': case.plaintiff or '',
-                'المستأنف ضده': case.defendant or '',
-                'المحكمة': case.court.name if case.court else '',
-                'المستخدم': case.user.username if case.user else ''
-            })
-        
-        activities_data = []
-        for activity in activities:
-            activities_data.append({
-                'التاريخ': activity.created_at.strftime('%Y-%m-%d %H:%M'),
-                'المستخدم': activity.user.username if activity.user else '',
-                'النشاط': activity.action,
-                'التفاصيل': activity.details or '',
-                'المحكمة': activity.court.name if activity.court else ''
-            })
-        
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            pd.DataFrame(cases_data).to_excel(writer, sheet_name='القضايا', index=False)
-            pd.DataFrame(activities_data).to_excel(writer, sheet_name='سجل الأنشطة', index=False)
-        
-        output.seek(0)
-        
-        return send_file(
-            BytesIO(output.read()),
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            as_attachment=True,
-            download_name=f'تقرير_شامل_{datetime.now().strftime("%Y-%m-%d")}.xlsx'
+        path, _ = single_flight(
+            flight_key('export_report.excel', **filters),
+            lambda: excel_report_file(**filters),
+            ttl=REPORT_CACHE_TTL,
+            court_id=filters['court_id']
         )
+        try:
+            output = open(path, 'rb')
+        except FileNotFoundError:
+            # Written on another host or already cleaned up
+            output = open(excel_report_file(**filters), 'rb')
     except ImportError:
-        flash('Excel export requires pandas library', 'danger')
+        flash('Excel export requires openpyxl library', 'danger')
         return redirect(url_for('main.statistics'))
     except Exception as e:
         flash(f'Error exporting Excel: {str(e)}', 'danger')
         return redirect(url_for('main.statistics'))
 
+    return send_file(
+        output,
+        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        as_attachment=True,
+        download_name=f'تقرير_شامل_{datetime.now().strftime("%Y-%m-%d")}.xlsx'
+    )
+
 @main_bp.route('/control')
 @login_required
 def control():
     if not current_user.is_admin:
         flash('Access denied. Admin privileges required.', 'danger')
         return redirect(url_for('main.index'))
-    users = User.query.all()
-    cases = Case.query.all()
-    return render_template('control.html', users=users, cases=cases)
+    return render_template('control.html', summary=control_summary())
 
 @main_bp.route('/drop_all_tables_confirm')
 @login_required
@@ -811,6 +718,8 @@ def drop_all_tables_execute():
     try:
         db.drop_all()
         db.create_all()
+        cache.clear()
+        drop_case_index()
         flash('All database tables dropped and recreated.', 'warning')
 
         create_defaults()
@@ -848,7 +757,7 @@ def create_defaults():
          }
          default_visible = ['case_number', 'next_session_date', 'case_subject',
                             'plaintiff', 'defendant', 'status']
-         case_fields = [column.name for column in Case.__table__.columns if column.name != 'id']
+         case_fields = case_display_fields()
 
          for field_name in case_fields:
              if not DisplaySettings.query.filter_by(field_name=field_name).first():
@@ -0,0 +1,34 @@
+import click
+from datetime import datetime
+from app.utils.cause_lists import generate_daily_cause_lists
+from app.utils.rollups import rebuild_rollups
+from extensions import db
+
+
+def register_commands(app):
+    @app.cli.command('build-cause-lists')
+    @click.option('--date', 'list_date', help='Session day to build (YYYY-MM-DD). Defaults to today.')
+    @click.option('--refresh', is_flag=True, help='Rebuild lists that were already generated.')
+    def build_cause_lists(list_date, refresh):
+        """Precompute every active court's daily cause list."""
+        try:
+            day = datetime.strptime(list_date, '%Y-%m-%d').date() if list_date else None
+        except ValueError:
+            raise click.BadParameter('Use YYYY-MM-DD.', param_hint='--date')
+
+        for court_id, case_count, error in generate_daily_cause_lists(app, day, refresh=refresh):
+            if error:
+                click.echo(f'Court {court_id}: failed ({error})')
+            else:
+                click.echo(f'Court {court_id}: {case_count} case(s)')
+
+    @app.cli.command('rebuild-statistics')
+    def rebuild_statistics():
+        """Recompute the statistics rollup tables from tblcase and tblcase_status_change."""
+        try:
+            written = rebuild_rollups()
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            raise click.ClickException(f'Rebuild failed: {e}')
+        click.echo(f'Rebuilt statistics rollups: {written} row(s)')
@@ -1,9 +1,11 @@
 
 from flask_login import UserMixin
-from datetime import datetime
+from datetime import datetime, date
 from flask_sqlalchemy import SQLAlchemy
+import re
 from enum import Enum
 from sqlalchemy import Enum as SQLAlchemyEnum
+from sqlalchemy.orm import validates
 
 from extensions import db
 
@@ -45,15 +47,75 @@ class CaseStatus(Enum):
     postponed = 'postponed'
     in_session = 'in session'
 
+_SESSION_DATE_FORMATS = ('%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y', '%Y/%m/%d')
+
+
+def parse_session_date(value):
+    """Normalize a free-text session date (as typed or imported) to a date, or None."""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value).strip()
+    try:
+        return datetime.fromisoformat(text).date()
+    except ValueError:
+        pass
+    head = text.split()[0] if text else ''
+    for fmt in _SESSION_DATE_FORMATS:
+        try:
+            return datetime.strptime(head, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+_CASE_NUMBER_SEPARATORS = re.compile(r'\s*[/\\-]\s*')
+
+
+def parse_case_number(value):
+    """Split a case number like ``170/7103/2021`` or ``س/55/2023`` into (prefix, serial, year).
+
+    A trailing four-digit part is the year and the first other numeric part the
+    serial; the remaining parts (circuit code, letter) form the prefix. Parts
+    that cannot be found are None.
+    """
+    parts = [part for part in _CASE_NUMBER_SEPARATORS.split(str(value or '').strip()) if part]
+    year = serial = None
+    if len(parts) > 1 and parts[-1].isdigit() and len(parts[-1]) == 4:
+        year = int(parts.pop())
+    for position, part in enumerate(parts):
+        if part.isdigit():
+            serial = int(parts.pop(position))
+            break
+    prefix = '/'.join(parts) or None
+    return prefix, serial, year
+
+
+def case_number_columns(value):
+    """The derived case-number columns of a Case row, for Core inserts that skip the validator."""
+    prefix, serial, year = parse_case_number(value)
+    return {'case_prefix': prefix, 'case_serial': serial, 'case_year': year}
+
 class Case(db.Model):
     __tablename__ = 'tblcase'
+    # Columns maintained by the application, never shown on the display board
+    INTERNAL_COLUMNS = ('id', 'session_date', 'updated_at', 'case_prefix', 'case_serial', 'case_year')
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('tbluser.id', ondelete='SET NULL'), nullable=True)
     case_number = db.Column(db.String(50), nullable=False)
+    # Parsed from case_number for natural ordering and year/serial filters
+    case_prefix = db.Column(db.String(50), nullable=True)
+    case_serial = db.Column(db.Integer, nullable=True)
+    case_year = db.Column(db.Integer, nullable=True)
     case_date = db.Column(db.Date, nullable=True)
     added_date = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     c_order = db.Column(db.Integer, nullable=False)
     next_session_date = db.Column(db.String(100), nullable=True)
+    session_date = db.Column(db.Date, nullable=True)
     session_result = db.Column(db.Text, nullable=True)
     num_sessions = db.Column(db.Integer, nullable=False, default=1)
     case_subject = db.Column(db.String(200), nullable=True)
@@ -67,6 +129,105 @@ class Case(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint('court_id', 'case_number', name='uq_case_number_per_court'),
+        db.Index('ix_case_court_session_date', 'court_id', 'session_date'),
+        db.Index('ix_case_court_order', 'court_id', 'c_order'),
+        db.Index('ix_case_court_date_order', 'court_id', 'case_date', 'c_order'),
+        db.Index('ix_case_court_id', 'court_id', 'id'),
+        db.Index('ix_case_court_updated_at', 'court_id', 'updated_at'),
+        db.Index('ix_case_court_number_parts', 'court_id', 'case_year', 'case_serial'),
+        db.Index('ix_case_added_date', 'added_date'),
+        db.Index('ix_case_user_id', 'user_id'),
+    )
+
+    @classmethod
+    def natural_order(cls):
+        """ORDER BY clauses sorting case numbers naturally (2/2024 before 10/2024)."""
+        return (
+            cls.case_prefix.asc().nullsfirst(),
+            cls.case_year.asc().nullslast(),
+            cls.case_serial.asc().nullslast(),
+            cls.case_number.asc(),
+        )
+
+    @validates('case_number')
+    def _sync_case_number_parts(self, key, value):
+        self.case_prefix, self.case_serial, self.case_year = parse_case_number(value)
+        return value
+
+    @validates('next_session_date')
+    def _sync_session_date(self, key, value):
+        self.session_date = parse_session_date(value)
+        return value
+
+
+def case_display_fields():
+    """Case columns that can be configured in DisplaySettings."""
+    return [c.name for c in Case.__table__.columns if c.name not in Case.INTERNAL_COLUMNS]
+
+class CourtSequence(db.Model):
+    """Last ``c_order`` handed out per court; see app.utils.sequences."""
+    __tablename__ = 'tblcourt_sequence'
+    court_id = db.Column(db.Integer, db.ForeignKey('tblcourt.id', ondelete='CASCADE', name='fk_sequence_court'), primary_key=True)
+    last_order = db.Column(db.Integer, nullable=False, default=0)
+
+class CourtCacheVersion(db.Model):
+    """Bumped on every change to a court's cases so other workers drop their caches; see app.utils.cache."""
+    __tablename__ = 'tblcourt_cache_version'
+    court_id = db.Column(db.Integer, db.ForeignKey('tblcourt.id', ondelete='CASCADE', name='fk_cache_version_court'), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+class ComputationLock(db.Model):
+    """Lock and short-lived shared result of an expensive computation; see app.utils.single_flight."""
+    __tablename__ = 'tblcomputation_lock'
+    key = db.Column(db.String(255), primary_key=True)
+    owner = db.Column(db.String(64), nullable=True)
+    locked_until = db.Column(db.DateTime, nullable=True)
+    payload = db.Column(db.LargeBinary, nullable=True)
+    expires_at = db.Column(db.DateTime, nullable=True)
+
+class CaseStatusChange(db.Model):
+    """One row per change of a case's status; see app.utils.rollups."""
+    __tablename__ = 'tblcase_status_change'
+    id = db.Column(db.Integer, primary_key=True)
+    case_id = db.Column(db.Integer, db.ForeignKey('tblcase.id', ondelete='SET NULL', name='fk_status_change_case'), nullable=True)
+    court_id = db.Column(db.Integer, db.ForeignKey('tblcourt.id', ondelete='SET NULL', name='fk_status_change_court'), nullable=True)
+    from_status = db.Column(SQLAlchemyEnum(CaseStatus), nullable=True)
+    to_status = db.Column(SQLAlchemyEnum(CaseStatus), nullable=True)
+    changed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    user_id = db.Column(db.Integer, db.ForeignKey('tbluser.id', ondelete='SET NULL', name='fk_status_change_user'), nullable=True)
+
+    __table_args__ = (
+        db.Index('ix_status_change_to_status_changed_at', 'to_status', 'changed_at'),
+        db.Index('ix_status_change_court_changed_at', 'court_id', 'changed_at'),
+        db.Index('ix_status_change_case_id', 'case_id'),
+    )
+
+class CaseStatusRollup(db.Model):
+    """Number of cases per court, case date and current status; see app.utils.rollups."""
+    __tablename__ = 'tblcase_status_rollup'
+    id = db.Column(db.Integer, primary_key=True)
+    court_id = db.Column(db.Integer, db.ForeignKey('tblcourt.id', ondelete='SET NULL', name='fk_status_rollup_court'), nullable=True)
+    case_date = db.Column(db.Date, nullable=True)
+    status = db.Column(SQLAlchemyEnum(CaseStatus), nullable=True)
+    case_count = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.Index('ix_status_rollup_court_date', 'court_id', 'case_date'),
+    )
+
+class CourtDailyRollup(db.Model):
+    """Cases added and status changes per court and day; see app.utils.rollups."""
+    __tablename__ = 'tblcourt_daily_rollup'
+    id = db.Column(db.Integer, primary_key=True)
+    court_id = db.Column(db.Integer, db.ForeignKey('tblcourt.id', ondelete='SET NULL', name='fk_daily_rollup_court'), nullable=True)
+    day = db.Column(db.Date, nullable=False)
+    new_cases = db.Column(db.Integer, nullable=False, default=0)
+    finished_cases = db.Column(db.Integer, nullable=False, default=0)
+    postponed_cases = db.Column(db.Integer, nullable=False, default=0)
+    status_changes = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.Index('ix_daily_rollup_day_court', 'day', 'court_id'),
     )
 
 class DisplayCase(db.Model):
@@ -104,3 +265,24 @@ class ActivityLog(db.Model):
     user = db.relationship('User', backref='activity_logs')
     case = db.relationship('Case', backref='activity_logs')
     court = db.relationship('Court', backref='activity_logs')
+
+    __table_args__ = (
+        db.Index('ix_activity_court_created_at', 'court_id', 'created_at'),
+        db.Index('ix_activity_action_created_at', 'action', 'created_at'),
+        db.Index('ix_activity_user_created_at', 'user_id', 'created_at'),
+    )
+
+class CauseList(db.Model):
+    __tablename__ = 'tblcause_list'
+    id = db.Column(db.Integer, primary_key=True)
+    court_id = db.Column(db.Integer, db.ForeignKey('tblcourt.id', ondelete='CASCADE', name='fk_cause_list_court'), nullable=False)
+    list_date = db.Column(db.Date, nullable=False)
+    case_count = db.Column(db.Integer, nullable=False, default=0)
+    payload = db.Column(db.Text, nullable=False)
+    html = db.Column(db.Text, nullable=False)
+    print_html = db.Column(db.Text, nullable=False)
+    generated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('court_id', 'list_date', name='uq_cause_list_court_date'),
+    )
@@ -0,0 +1,95 @@
+from sqlalchemy import Date, Integer, case, cast, func, select
+from app.models.models import Case, CaseStatus, CaseStatusChange, Court
+from extensions import db
+
+# Percentiles reported for time-to-finish (nearest-rank method)
+DURATION_PERCENTILES = (50, 90)
+DURATION_GROUPS = ('court', 'subject')
+SUBJECT_GROUP_LIMIT = 50
+
+
+def _days_between(later, earlier):
+    """Whole days from ``earlier`` to ``later`` as an SQL expression."""
+    if db.session.get_bind().dialect.name == 'sqlite':
+        return cast(func.julianday(func.date(later)) - func.julianday(earlier), Integer)
+    return cast(later, Date) - cast(earlier, Date)
+
+
+def _finished_cases(keys, start_date=None, end_date=None, court_id=None):
+    """Finished cases with their time-to-finish, ranked within each group of ``keys``.
+
+    A case is finished at its latest change to ``finished`` in
+    tblcase_status_change; finished cases without one are left out.
+    """
+    finished = (
+        select(CaseStatusChange.case_id, func.max(CaseStatusChange.changed_at).label('finished_at'))
+        .where(CaseStatusChange.to_status == CaseStatus.finished, CaseStatusChange.case_id.isnot(None))
+        .group_by(CaseStatusChange.case_id)
+        .subquery()
+    )
+    days = _days_between(finished.c.finished_at, Case.case_date)
+    stmt = (
+        select(
+            *keys,
+            days.label('days'),
+            Case.num_sessions,
+            func.row_number().over(partition_by=keys, order_by=days).label('position'),
+            func.count().over(partition_by=keys).label('total')
+        )
+        .join(finished, finished.c.case_id == Case.id)
+        .where(Case.status == CaseStatus.finished, Case.case_date.isnot(None))
+    )
+    if start_date:
+        stmt = stmt.where(Case.case_date >= start_date)
+    if end_date:
+        stmt = stmt.where(Case.case_date <= end_date)
+    if court_id:
+        stmt = stmt.where(Case.court_id == court_id)
+    return stmt.subquery('ranked')
+
+
+def duration_percentiles(group='court', start_date=None, end_date=None, court_id=None, limit=SUBJECT_GROUP_LIMIT):
+    """Time-to-finish distribution and session counts per court, or per court and subject.
+
+    Ranking and percentile picking happen in the database with window
+    functions; one row per group is returned, largest groups first:
+    ``court_id``, ``court_name``, (``case_subject``,) ``cases``,
+    ``p50_days``, ``p90_days``, ``avg_days``, ``max_days``, ``avg_sessions``.
+    """
+    keys = [Case.court_id]
+    if group == 'subject':
+        keys.append(Case.case_subject)
+    ranked = _finished_cases(keys, start_date, end_date, court_id)
+    group_columns = [ranked.c[key.key] for key in keys]
+
+    percentiles = [
+        # Nearest rank: the ceil(p * n / 100)-th smallest value
+        func.max(case(
+            (ranked.c.position == (percent * ranked.c.total + 99) // 100, ranked.c.days)
+        )).label(f'p{percent}_days')
+        for percent in DURATION_PERCENTILES
+    ]
+    stmt = (
+        select(
+            *group_columns,
+            Court.name.label('court_name'),
+            func.count().label('cases'),
+            *percentiles,
+            func.avg(ranked.c.days).label('avg_days'),
+            func.max(ranked.c.days).label('max_days'),
+            func.avg(ranked.c.num_sessions).label('avg_sessions')
+        )
+        .outerjoin(Court, Court.id == ranked.c.court_id)
+        .group_by(*group_columns, Court.name)
+        .order_by(func.count().desc(), *group_columns)
+    )
+    if group == 'subject' and limit:
+        stmt = stmt.limit(limit)
+
+    rows = []
+    for row in db.session.execute(stmt).mappings():
+        item = dict(row)
+        item['avg_days'] = round(item['avg_days'], 1) if item['avg_days'] is not None else None
+        item['avg_sessions'] = round(item['avg_sessions'], 1) if item['avg_sessions'] is not None else None
+        rows.append(item)
+    return rows
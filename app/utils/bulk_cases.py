@@ -0,0 +1,182 @@
+from collections import defaultdict
+from datetime import datetime
+from sqlalchemy import delete, insert, select, update
+from app.models.models import ActivityLog, Case, CaseStatus, DisplayCase, case_number_columns, parse_session_date
+from app.utils.rollups import RollupChanges
+from app.utils.sequences import allocate_case_orders, close_case_order_gaps
+from extensions import db
+
+# Keeps each IN (...) list well below SQLite's bound-parameter limit
+CHUNK_SIZE = 500
+
+
+def _chunks(items, size=CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def existing_case_numbers(court_id, case_numbers, session=None):
+    """Return the subset of ``case_numbers`` already used in the court, one query per CHUNK_SIZE numbers."""
+    session = session or db.session
+    existing = set()
+    for chunk in _chunks(list(case_numbers)):
+        existing.update(session.execute(
+            select(Case.case_number)
+            .where(Case.court_id == court_id, Case.case_number.in_(chunk))
+        ).scalars())
+    return existing
+
+
+def create_cases(court_id, cases, user_id=None, session=None):
+    """Insert many new cases of one court; ``cases`` is a list of validated column dicts.
+
+    The court's ``c_order`` block is allocated with one counter update, the
+    rows go in with a single executemany INSERT ... RETURNING, and one
+    'Case Added' activity row per case is written in a second executemany.
+    Uniqueness is left to ``uq_case_number_per_court``; runs in the caller's
+    transaction and returns the inserted ``(id, case_number, c_order)`` rows.
+    """
+    session = session or db.session
+    if not cases:
+        return []
+
+    first_order = allocate_case_orders(court_id, count=len(cases), session=session)
+    now = datetime.utcnow()
+    rows = []
+    for offset, values in enumerate(cases):
+        row = dict(values)
+        row.update(
+            court_id=court_id,
+            user_id=user_id,
+            c_order=first_order + offset,
+            # Core inserts bypass the model validators that keep the derived columns in sync
+            session_date=parse_session_date(row.get('next_session_date')),
+            **case_number_columns(row['case_number']),
+            added_date=now,
+            updated_at=now
+        )
+        rows.append(row)
+
+    inserted = session.execute(
+        insert(Case).returning(Case.id, Case.case_number, Case.c_order, sort_by_parameter_order=True),
+        rows
+    ).all()
+
+    rollups = RollupChanges()
+    for row in rows:
+        rollups.case_added(court_id, row.get('case_date'), row.get('status', CaseStatus.inactive), now)
+    rollups.apply(session.connection())
+
+    session.execute(insert(ActivityLog), [
+        {
+            'user_id': user_id,
+            'action': 'Case Added',
+            'details': f"Added case {row['case_number']}: {row.get('case_subject')}",
+            'case_id': case.id,
+            'court_id': court_id,
+            'created_at': now
+        }
+        for case, row in zip(inserted, rows)
+    ])
+    return inserted
+
+
+def delete_cases(case_ids_select, user_id=None, session=None):
+    """Delete the cases whose ids are returned by ``case_ids_select``, set-based.
+
+    Display entries of those cases go with them, their activity logs are kept
+    but detached (case_id NULL, as deleting a single case does), later orders
+    in each court are shifted down, and one 'Case Deleted' activity row per
+    case is written in a single executemany. Runs in the caller's
+    transaction and returns the deleted ``(id, case_number, court_id, c_order)`` rows.
+    """
+    session = session or db.session
+    rows = session.execute(
+        select(Case.id, Case.case_number, Case.court_id, Case.c_order, Case.case_date, Case.status)
+        .where(Case.id.in_(case_ids_select))
+    ).all()
+    if not rows:
+        return rows
+
+    ids = [row.id for row in rows]
+    for chunk in _chunks(ids):
+        session.execute(delete(DisplayCase).where(DisplayCase.case_id.in_(chunk)))
+        session.execute(update(ActivityLog).where(ActivityLog.case_id.in_(chunk)).values(case_id=None))
+        session.execute(delete(Case).where(Case.id.in_(chunk)))
+
+    rollups = RollupChanges()
+    for row in rows:
+        rollups.case_removed(row.court_id, row.case_date, row.status, case_id=row.id)
+    rollups.apply(session.connection())
+
+    deleted_orders = defaultdict(list)
+    for row in rows:
+        deleted_orders[row.court_id].append(row.c_order)
+    close_case_order_gaps(deleted_orders, session=session)
+
+    now = datetime.utcnow()
+    session.execute(insert(ActivityLog), [
+        {
+            'user_id': user_id,
+            'action': 'Case Deleted',
+            'details': f'Deleted case {row.case_number}',
+            'case_id': None,
+            'court_id': row.court_id,
+            'created_at': now
+        }
+        for row in rows
+    ])
+    return rows
+
+
+def change_case_statuses(changes, court_id=None, user_id=None, session=None):
+    """Apply many status changes at once; ``changes`` maps case_id to a CaseStatus.
+
+    Cases outside ``court_id`` (when given) or already in the requested status
+    are ignored. The rows are updated with one UPDATE ... WHERE id IN per
+    target status, and every transition is logged and added to the status
+    history in a single executemany each.
+    Runs in the caller's transaction and returns ``(case_id, court_id, old, new)`` tuples.
+    """
+    session = session or db.session
+    if not changes:
+        return []
+
+    now = datetime.utcnow()
+    transitions = []
+    rollups = RollupChanges()
+    for chunk in _chunks(list(changes)):
+        stmt = select(Case.id, Case.court_id, Case.case_date, Case.status).where(Case.id.in_(chunk))
+        if court_id is not None:
+            stmt = stmt.where(Case.court_id == court_id)
+        for row in session.execute(stmt):
+            new_status = changes[row.id]
+            if row.status != new_status:
+                transitions.append((row.id, row.court_id, row.status, new_status))
+                rollups.case_changed(
+                    (row.court_id, row.case_date, row.status), (row.court_id, row.case_date, new_status),
+                    changed_at=now, case_id=row.id, user_id=user_id
+                )
+    if not transitions:
+        return []
+
+    ids_by_status = defaultdict(list)
+    for case_id, _, _, new_status in transitions:
+        ids_by_status[new_status].append(case_id)
+    for new_status, ids in ids_by_status.items():
+        for chunk in _chunks(ids):
+            session.execute(update(Case).where(Case.id.in_(chunk)).values(status=new_status))
+    rollups.apply(session.connection())
+
+    session.execute(insert(ActivityLog), [
+        {
+            'user_id': user_id,
+            'action': 'Status Changed',
+            'details': f"Changed status from {old_status.value if old_status else 'unknown'} to {new_status.value}",
+            'case_id': case_id,
+            'court_id': case_court_id,
+            'created_at': now
+        }
+        for case_id, case_court_id, old_status, new_status in transitions
+    ])
+    return transitions
@@ -0,0 +1,193 @@
+import threading
+import time
+from datetime import date
+from flask import current_app
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from app.models.models import CauseList, CourtCacheVersion
+from extensions import db
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Small thread-safe in-process cache with per-entry expiry.
+
+    Keys are tuples of the form ``(namespace, court_id, ...)`` so that every
+    entry derived from a court's cases can be dropped in one call when that
+    court's data changes. Entries keyed under ``court_id=None`` span all
+    courts and are dropped whenever any court changes.
+    """
+
+    def __init__(self, default_ttl=300):
+        self.default_ttl = default_ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return default
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+
+    def get_or_set(self, key, factory, ttl=None):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = factory()
+            self.set(key, value, ttl)
+        return value
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_matching(self, predicate):
+        with self._lock:
+            for key in [k for k in self._entries if predicate(k)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+cache = TTLCache()
+
+
+# --- Cross-worker invalidation -------------------------------------------
+# Each process keeps its own caches, so invalidate_court() also bumps the
+# court's row in tblcourt_cache_version. sync_court_caches() (run before
+# requests, at most every CACHE_SYNC_INTERVAL seconds) drops the local
+# entries of every court whose version moved in another process. Stored
+# cause lists (tblcause_list) are shared by all workers; case writes delete
+# them in the same transaction as the bump.
+
+_known_versions = {}
+_sync_state = {'last_sync': 0.0}
+_sync_lock = threading.Lock()
+_remote_listeners = []
+
+
+def on_remote_invalidation(callback):
+    """Register ``callback(court_id)`` to run when another worker changed a court."""
+    _remote_listeners.append(callback)
+    return callback
+
+
+def _drop_court_entries(court_id):
+    cache.delete_matching(lambda key: len(key) > 1 and (key[1] == court_id or key[1] is None))
+
+
+def _increment_version(court_id):
+    stmt = (
+        update(CourtCacheVersion)
+        .where(CourtCacheVersion.court_id == court_id)
+        .values(version=CourtCacheVersion.version + 1)
+    )
+    if db.session.get_bind().dialect.update_returning:
+        return db.session.execute(stmt.returning(CourtCacheVersion.version)).scalar()
+    if db.session.execute(stmt).rowcount == 0:
+        return None
+    return db.session.execute(
+        select(CourtCacheVersion.version).where(CourtCacheVersion.court_id == court_id)
+    ).scalar()
+
+
+def _bump_court_version(court_id, drop_cause_lists):
+    try:
+        if drop_cause_lists:
+            # Lists of past days are kept as they were printed
+            db.session.execute(
+                delete(CauseList).where(CauseList.court_id == court_id, CauseList.list_date >= date.today())
+            )
+        version = _increment_version(court_id)
+        if version is None:
+            try:
+                with db.session.begin_nested():
+                    db.session.execute(insert(CourtCacheVersion).values(court_id=court_id, version=1))
+                version = 1
+            except IntegrityError:
+                version = _increment_version(court_id)
+        db.session.commit()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        print(f"Warning: Could not publish cache invalidation for court {court_id}: {e}")
+        return
+    with _sync_lock:
+        # Only skip our own bump; if another worker bumped in between, the next sync drops the court
+        if _known_versions.get(court_id, 0) == version - 1:
+            _known_versions[court_id] = version
+
+
+def invalidate_court(court_id, cause_lists=True):
+    """Drop every cached entry derived from the cases of ``court_id``, in every worker.
+
+    With ``cause_lists`` (for writes that change the cases themselves) the
+    court's stored cause lists from today on are deleted as well; display
+    board changes pass False. Call it after the change is committed: the
+    version bump runs in its own small transaction.
+    """
+    if court_id is None:
+        return
+    _drop_court_entries(court_id)
+    _bump_court_version(court_id, cause_lists)
+
+
+def data_version(court_id=None):
+    """Token that changes with every invalidate_court() of ``court_id``, or of any court when None.
+
+    Lets results shared outside this process (e.g. by app.utils.single_flight)
+    be keyed by the data they were computed from.
+    """
+    if court_id is None:
+        count, total = db.session.execute(
+            select(func.count(), func.coalesce(func.sum(CourtCacheVersion.version), 0))
+        ).one()
+        return f'{count}.{total}'
+    version = db.session.execute(
+        select(CourtCacheVersion.version).where(CourtCacheVersion.court_id == court_id)
+    ).scalar()
+    return str(version or 0)
+
+
+def sync_court_caches(force=False):
+    """Drop local cache entries of courts invalidated by other workers since the last check."""
+    now = time.monotonic()
+    with _sync_lock:
+        interval = current_app.config.get('CACHE_SYNC_INTERVAL', 2)
+        if not force and now - _sync_state['last_sync'] < interval:
+            return
+        _sync_state['last_sync'] = now
+
+    try:
+        versions = db.session.execute(select(CourtCacheVersion.court_id, CourtCacheVersion.version)).all()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        print(f"Warning: Could not check cache versions: {e}")
+        return
+
+    changed = []
+    with _sync_lock:
+        for court_id, version in versions:
+            if _known_versions.get(court_id) != version:
+                _known_versions[court_id] = version
+                changed.append(court_id)
+        # A row that disappeared means the tables were reset
+        present = {court_id for court_id, _ in versions}
+        for court_id in [court_id for court_id in _known_versions if court_id not in present]:
+            del _known_versions[court_id]
+            changed.append(court_id)
+    for court_id in changed:
+        _drop_court_entries(court_id)
+        for callback in _remote_listeners:
+            callback(court_id)
@@ -0,0 +1,121 @@
+import bisect
+import threading
+import time
+from sqlalchemy import select
+from app.models.models import Case
+from app.utils.cache import on_remote_invalidation
+from extensions import db
+
+# Rebuild from the database after this long even without invalidations, as a safety net
+INDEX_MAX_AGE = 600
+DEFAULT_SUGGESTIONS = 10
+
+
+def normalize_case_number(case_number):
+    return str(case_number).strip().casefold()
+
+
+class CaseNumberIndex:
+    """Sorted ``(key, case_id, case_number)`` entries of one court for prefix lookups.
+
+    Lookups are a binary search plus a walk over the matches, so they cost
+    O(log n + k) and never touch the database.
+    """
+
+    def __init__(self, rows):
+        self._entries = sorted((normalize_case_number(number), case_id, number) for case_id, number in rows)
+        self._lock = threading.Lock()
+        self.built_at = time.monotonic()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def search(self, prefix, limit=DEFAULT_SUGGESTIONS):
+        key = normalize_case_number(prefix)
+        with self._lock:
+            start = bisect.bisect_left(self._entries, (key,))
+            matches = []
+            for entry_key, case_id, number in self._entries[start:start + limit]:
+                if not entry_key.startswith(key):
+                    break
+                matches.append((case_id, number))
+            return matches
+
+    def add(self, case_id, case_number):
+        entry = (normalize_case_number(case_number), case_id, case_number)
+        with self._lock:
+            position = bisect.bisect_left(self._entries, entry)
+            if position == len(self._entries) or self._entries[position] != entry:
+                self._entries.insert(position, entry)
+
+    def remove(self, case_id, case_number):
+        entry = (normalize_case_number(case_number), case_id, case_number)
+        with self._lock:
+            position = bisect.bisect_left(self._entries, entry)
+            if position < len(self._entries) and self._entries[position] == entry:
+                del self._entries[position]
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def _build_index(court_id):
+    rows = db.session.execute(select(Case.id, Case.case_number).where(Case.court_id == court_id)).all()
+    return CaseNumberIndex(rows)
+
+
+def get_case_index(court_id):
+    """Return the court's index, building it on first use (or once it is INDEX_MAX_AGE old)."""
+    with _indexes_lock:
+        index = _indexes.get(court_id)
+    if index is not None and time.monotonic() - index.built_at < INDEX_MAX_AGE:
+        return index
+    index = _build_index(court_id)
+    with _indexes_lock:
+        _indexes[court_id] = index
+    return index
+
+
+def suggest_case_numbers(court_id, prefix, limit=DEFAULT_SUGGESTIONS):
+    """``(case_id, case_number)`` pairs of the court whose number starts with ``prefix``."""
+    return get_case_index(court_id).search(prefix, limit)
+
+
+def _loaded_index(court_id):
+    # Incremental updates only matter for an index that is already built
+    with _indexes_lock:
+        return _indexes.get(court_id)
+
+
+def index_cases_added(court_id, rows):
+    """Add committed ``(case_id, case_number)`` rows to the court's index."""
+    index = _loaded_index(court_id)
+    if index is not None:
+        for case_id, case_number in rows:
+            index.add(case_id, case_number)
+
+
+def index_cases_removed(court_id, rows):
+    """Remove deleted ``(case_id, case_number)`` rows from the court's index."""
+    index = _loaded_index(court_id)
+    if index is not None:
+        for case_id, case_number in rows:
+            index.remove(case_id, case_number)
+
+
+def index_case_renamed(court_id, case_id, old_number, new_number):
+    index = _loaded_index(court_id)
+    if index is not None:
+        index.remove(case_id, old_number)
+        index.add(case_id, new_number)
+
+
+@on_remote_invalidation
+def drop_case_index(court_id=None):
+    """Forget the index of ``court_id`` (or of every court); it is rebuilt on next use."""
+    with _indexes_lock:
+        if court_id is None:
+            _indexes.clear()
+        else:
+            _indexes.pop(court_id, None)
@@ -0,0 +1,161 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import render_template
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from app.models.models import Case, CauseList, Court
+from app.utils.cache import cache
+from app.utils.dashboards import board_cases, dashboard_summary
+from app.utils.session_calendar import session_counts_for_month
+from extensions import db
+
+# Warmed entries must outlive the day until the next scheduled run
+WARM_CACHE_TTL = 25 * 60 * 60
+
+
+def cause_list_cases(court_id, day):
+    """Cases of a court with a session on ``day``, ordered by ``c_order``."""
+    stmt = (
+        select(
+            Case.id, Case.c_order, Case.case_number, Case.next_session_date,
+            Case.case_subject, Case.plaintiff, Case.defendant,
+            Case.num_sessions, Case.session_result, Case.status
+        )
+        .where(Case.court_id == court_id, Case.session_date == day)
+        .order_by(Case.c_order.asc())
+    )
+    cases = []
+    for row in db.session.execute(stmt).mappings():
+        item = dict(row)
+        item['status'] = item['status'].value if item['status'] else None
+        cases.append(item)
+    return cases
+
+
+def build_cause_list(court_id, day):
+    """Render and store the cause list snapshot (JSON, HTML and printable HTML) of a court."""
+    court = db.session.get(Court, court_id)
+    cases = cause_list_cases(court_id, day)
+    generated_at = datetime.utcnow()
+    payload = {
+        'court_id': court_id,
+        'court_name': court.name,
+        'date': day.isoformat(),
+        'generated_at': generated_at.isoformat(),
+        'cases': cases
+    }
+    context = dict(court=court, day=day, cases=cases, generated_at=generated_at)
+
+    snapshot = CauseList.query.filter_by(court_id=court_id, list_date=day).first()
+    if not snapshot:
+        snapshot = CauseList(court_id=court_id, list_date=day)
+        db.session.add(snapshot)
+    snapshot.case_count = len(cases)
+    snapshot.payload = json.dumps(payload, ensure_ascii=False)
+    snapshot.html = render_template('cause_list.html', printable=False, **context)
+    snapshot.print_html = render_template('cause_list.html', printable=True, **context)
+    snapshot.generated_at = generated_at
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Another worker stored the same list first; serve theirs
+        db.session.rollback()
+        snapshot = CauseList.query.filter_by(court_id=court_id, list_date=day).first()
+    return snapshot
+
+
+def get_cause_list(court_id, day, refresh=False):
+    """Return the stored cause list of a court for ``day``, building it if missing.
+
+    invalidate_court() deletes a court's lists from today on whenever its
+    cases change, so they are rebuilt on their next request.
+    """
+    if not refresh:
+        snapshot = CauseList.query.filter_by(court_id=court_id, list_date=day).first()
+        if snapshot:
+            return snapshot
+    return build_cause_list(court_id, day)
+
+
+def warm_court_caches(court_id, day, ttl=WARM_CACHE_TTL):
+    """Reload a court's board, dashboard and session calendar caches to live for ``ttl`` seconds.
+
+    The entries are still dropped as soon as the court's cases change.
+    """
+    for key in (('board', court_id), ('dashboard', court_id), ('session_calendar', court_id, day.year, day.month)):
+        cache.delete(key)
+    board_cases(court_id, ttl=ttl)
+    dashboard_summary(court_id, ttl=ttl)
+    session_counts_for_month(court_id, day.year, day.month, ttl=ttl)
+
+
+def _prepare_court(app, court_id, day, refresh, warm):
+    with app.app_context():
+        try:
+            snapshot = get_cause_list(court_id, day, refresh=refresh)
+            if warm:
+                warm_court_caches(court_id, day)
+            return court_id, snapshot.case_count, None
+        except Exception as e:
+            db.session.rollback()
+            return court_id, 0, str(e)
+
+
+def generate_daily_cause_lists(app, day=None, refresh=False, max_workers=None, warm=False):
+    """Build every active court's cause list for ``day`` in parallel.
+
+    With ``warm``, also reload each court's caches in this process (see
+    warm_court_caches()). Returns a list of ``(court_id, case_count, error)`` tuples.
+    """
+    with app.app_context():
+        day = day or datetime.now().date()
+        max_workers = max_workers or app.config.get('CAUSE_LIST_WORKERS', 4)
+        court_ids = [court_id for (court_id,) in db.session.query(Court.id).filter_by(is_active=True).all()]
+
+    if not court_ids:
+        return []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda court_id: _prepare_court(app, court_id, day, refresh, warm), court_ids))
+
+
+def _seconds_until(hour, minute):
+    now = datetime.now()
+    next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if next_run <= now:
+        next_run += timedelta(days=1)
+    return (next_run - now).total_seconds()
+
+
+def start_cause_list_scheduler(app):
+    """Run generate_daily_cause_lists daily at CAUSE_LIST_SCHEDULE (HH:MM) in a daemon thread.
+
+    Every worker process runs its own scheduler so that its in-process caches
+    get warmed; lists another worker already stored are reused, and the
+    unique (court, day) constraint keeps one each.
+    """
+    run_at = app.config.get('CAUSE_LIST_SCHEDULE')
+    if not run_at:
+        return None
+    try:
+        hour, minute = map(int, run_at.split(':'))
+        datetime.now().replace(hour=hour, minute=minute)
+    except ValueError:
+        print(f"Warning: Invalid CAUSE_LIST_SCHEDULE '{run_at}', expected HH:MM. Scheduler disabled.")
+        return None
+
+    def run_forever():
+        while True:
+            time.sleep(_seconds_until(hour, minute))
+            try:
+                for court_id, count, error in generate_daily_cause_lists(app, warm=True):
+                    if error:
+                        print(f"Error building cause list for court {court_id}: {error}")
+            except Exception as e:
+                print(f"Error generating daily cause lists: {e}")
+
+    thread = threading.Thread(target=run_forever, name='cause-list-scheduler', daemon=True)
+    thread.start()
+    return thread
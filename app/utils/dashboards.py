@@ -0,0 +1,85 @@
+from sqlalchemy import case, func, select
+from app.models.models import Case, CaseStatus, CaseStatusRollup, DisplayCase, User
+from app.utils.cache import cache
+from extensions import db
+
+BOARD_CACHE_TTL = 30
+DASHBOARD_CACHE_TTL = 60
+LATEST_CASES_LIMIT = 10
+CONTROL_RECENT_LIMIT = 5
+
+
+def _query_board_cases(court_id):
+    stmt = (
+        select(*Case.__table__.columns)
+        .join(DisplayCase, DisplayCase.case_id == Case.id)
+        .where(Case.court_id == court_id)
+        .order_by(DisplayCase.custom_order.asc().nullsfirst(), DisplayCase.display_order.asc())
+    )
+    return [dict(row) for row in db.session.execute(stmt).mappings()]
+
+
+def board_cases(court_id, ttl=BOARD_CACHE_TTL):
+    """Cases shown on a court's public display board, as plain dicts in board order."""
+    return cache.get_or_set(('board', court_id), lambda: _query_board_cases(court_id), ttl=ttl)
+
+
+def _query_dashboard_summary(court_id):
+    status_counts = dict(
+        db.session.query(Case.status, db.func.count(Case.id))
+        .filter(Case.court_id == court_id)
+        .group_by(Case.status)
+        .all()
+    )
+    display_count = (
+        db.session.query(db.func.count(DisplayCase.id))
+        .join(Case, DisplayCase.case_id == Case.id)
+        .filter(Case.court_id == court_id)
+        .scalar()
+    )
+    latest_stmt = (
+        select(Case.id, Case.case_number, Case.case_subject, Case.next_session_date, Case.status)
+        .where(Case.court_id == court_id)
+        .order_by(Case.added_date.desc())
+        .limit(LATEST_CASES_LIMIT)
+    )
+    return {
+        'total_cases': sum(status_counts.values()),
+        'active_cases': status_counts.get(CaseStatus.active, 0),
+        'display_cases': display_count,
+        'latest_cases': [dict(row) for row in db.session.execute(latest_stmt).mappings()],
+    }
+
+
+def dashboard_summary(court_id, ttl=DASHBOARD_CACHE_TTL):
+    """Counts and latest cases for a court's user dashboard."""
+    return cache.get_or_set(('dashboard', court_id), lambda: _query_dashboard_summary(court_id), ttl=ttl)
+
+
+def control_summary():
+    """Counts and the most recent cases and users for the admin control page.
+
+    Case counts are summed from the status rollup and user counts come from one
+    aggregate query; only the recent rows are loaded.
+    """
+    status_counts = dict(db.session.execute(
+        select(CaseStatusRollup.status, func.sum(CaseStatusRollup.case_count))
+        .group_by(CaseStatusRollup.status)
+    ).all())
+    total_users, admin_users = db.session.execute(
+        select(func.count(User.id), func.sum(case((User.is_admin.is_(True), 1), else_=0)))
+    ).one()
+    recent_cases = select(
+        Case.id, Case.case_number, Case.case_subject, Case.next_session_date, Case.status
+    ).order_by(Case.id.desc()).limit(CONTROL_RECENT_LIMIT)
+    recent_users = select(
+        User.id, User.username, User.name, User.email, User.is_admin
+    ).order_by(User.id.desc()).limit(CONTROL_RECENT_LIMIT)
+    return {
+        'total_cases': sum(count or 0 for count in status_counts.values()),
+        'active_cases': status_counts.get(CaseStatus.active) or 0,
+        'total_users': total_users,
+        'admin_users': admin_users or 0,
+        'recent_cases': [dict(row) for row in db.session.execute(recent_cases).mappings()],
+        'recent_users': [dict(row) for row in db.session.execute(recent_users).mappings()],
+    }
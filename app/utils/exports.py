@@ -0,0 +1,216 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import time
+from datetime import date, datetime
+from flask import current_app
+from sqlalchemy import select
+from app.models.models import ActivityLog, Case, CaseStatus, Court, User
+from extensions import db
+
+CASE_EXPORT_FIELDS = (
+    'id', 'case_number', 'case_date', 'added_date', 'c_order', 'next_session_date',
+    'session_result', 'num_sessions', 'case_subject', 'defendant', 'plaintiff',
+    'prosecution_number', 'police_department', 'police_case_number', 'status', 'court_id'
+)
+EXPORT_FIELDS = CASE_EXPORT_FIELDS + ('court_name', 'user_name')
+
+# Rows fetched per round trip, and bytes buffered before each chunk is sent
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FLUSH_SIZE = 64 * 1024
+
+# Sheets of the full Excel report: (sheet title, column headers)
+REPORT_CASES_SHEET = ('القضايا', (
+    'رقم القضية', 'تاريخ القضية', 'الحالة', 'الموضوع', 'المستأنف', 'المستأنف ضده', 'المحكمة', 'المستخدم'
+))
+REPORT_ACTIVITIES_SHEET = ('سجل الأنشطة', ('التاريخ', 'المستخدم', 'النشاط', 'التفاصيل', 'المحكمة'))
+REPORT_ACTIVITY_LIMIT = 1000
+# Seconds a generated report file is reused by identical report requests;
+# files are deleted once they are REPORT_FILE_LIFETIME seconds old
+REPORT_CACHE_TTL = 60
+REPORT_FILE_LIFETIME = 10 * 60
+
+
+def serialize_value(value):
+    if isinstance(value, CaseStatus):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def iter_export_rows(query, batch_size=EXPORT_BATCH_SIZE):
+    """Yield one plain dict per case of an ORM case query, with court and user names joined in.
+
+    Only the exported columns are selected, and rows are fetched ``batch_size``
+    at a time (a server-side cursor where the driver supports it).
+    """
+    rows = (
+        query.outerjoin(Court, Case.court_id == Court.id)
+        .outerjoin(User, Case.user_id == User.id)
+        .with_entities(
+            *[getattr(Case, name) for name in CASE_EXPORT_FIELDS],
+            Court.name.label('court_name'),
+            User.username.label('user_name')
+        )
+        .yield_per(batch_size)
+    )
+    for row in rows:
+        yield {key: serialize_value(value) for key, value in row._mapping.items()}
+
+
+def generate_csv(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')  # Lets Excel detect UTF-8 for the Arabic text
+    writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        writer.writerow([row[name] for name in EXPORT_FIELDS])
+        if buffer.tell() >= EXPORT_FLUSH_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+    yield buffer.getvalue()
+
+
+def generate_ndjson(rows):
+    lines = []
+    size = 0
+    for row in rows:
+        line = json.dumps(row, ensure_ascii=False) + '\n'
+        lines.append(line)
+        size += len(line)
+        if size >= EXPORT_FLUSH_SIZE:
+            yield ''.join(lines)
+            lines = []
+            size = 0
+    yield ''.join(lines)
+
+
+def report_case_rows(start_date=None, end_date=None, court_id=None, batch_size=EXPORT_BATCH_SIZE):
+    """Yield the case rows of the Excel report, filtered like the statistics page."""
+    stmt = (
+        select(
+            Case.case_number, Case.case_date, Case.status, Case.case_subject,
+            Case.plaintiff, Case.defendant, Court.name, User.username
+        )
+        .outerjoin(Court, Case.court_id == Court.id)
+        .outerjoin(User, Case.user_id == User.id)
+        .order_by(Case.court_id, Case.c_order)
+    )
+    if start_date:
+        stmt = stmt.where(Case.case_date >= start_date)
+    if end_date:
+        stmt = stmt.where(Case.case_date <= end_date)
+    if court_id:
+        stmt = stmt.where(Case.court_id == court_id)
+
+    result = db.session.execute(stmt.execution_options(yield_per=batch_size))
+    for number, case_date, status, subject, plaintiff, defendant, court_name, username in result:
+        yield (
+            number,
+            case_date.strftime('%Y-%m-%d') if case_date else '',
+            status.value if status else '',
+            subject or '',
+            plaintiff or '',
+            defendant or '',
+            court_name or '',
+            username or ''
+        )
+
+
+def report_activity_rows(start_date=None, end_date=None, court_id=None, limit=REPORT_ACTIVITY_LIMIT):
+    """Yield the latest activity rows of the Excel report, filtered like the statistics page."""
+    stmt = (
+        select(ActivityLog.created_at, User.username, ActivityLog.action, ActivityLog.details, Court.name)
+        .outerjoin(User, ActivityLog.user_id == User.id)
+        .outerjoin(Court, ActivityLog.court_id == Court.id)
+        .order_by(ActivityLog.created_at.desc())
+        .limit(limit)
+    )
+    if start_date:
+        stmt = stmt.where(ActivityLog.created_at >= start_date)
+    if end_date:
+        stmt = stmt.where(ActivityLog.created_at <= end_date)
+    if court_id:
+        stmt = stmt.where(ActivityLog.court_id == court_id)
+
+    for created_at, username, action, details, court_name in db.session.execute(stmt):
+        yield (
+            created_at.strftime('%Y-%m-%d %H:%M') if created_at else '',
+            username or '',
+            action,
+            details or '',
+            court_name or ''
+        )
+
+
+def write_excel_report(case_rows, activity_rows, output=None):
+    """Write the report sheets with openpyxl's write-only workbook into ``output``.
+
+    Rows are appended as they arrive and flushed to disk, so memory use does not
+    grow with the number of cases. Without ``output`` a temporary file is used;
+    it is returned open and positioned at the start, and deleted once closed.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    for (title, headers), rows in ((REPORT_CASES_SHEET, case_rows), (REPORT_ACTIVITIES_SHEET, activity_rows)):
+        sheet = workbook.create_sheet(title)
+        sheet.sheet_view.rightToLeft = True
+        sheet.append(headers)
+        for row in rows:
+            sheet.append(row)
+
+    if output is not None:
+        workbook.save(output)
+        return output
+    output = tempfile.TemporaryFile(suffix='.xlsx')
+    try:
+        workbook.save(output)
+    except Exception:
+        output.close()
+        raise
+    output.seek(0)
+    return output
+
+
+def _report_dir():
+    directory = current_app.config.get('REPORT_CACHE_DIR') or os.path.join(tempfile.gettempdir(), 'case-reports')
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def _remove_old_reports(directory):
+    # Responses still streaming a removed file keep reading it (POSIX); elsewhere it is retried next time
+    cutoff = time.time() - REPORT_FILE_LIFETIME
+    for entry in os.scandir(directory):
+        try:
+            if entry.name.startswith('report-') and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def excel_report_file(start_date=None, end_date=None, court_id=None):
+    """Write the full Excel report for the filters into the report directory and return its path.
+
+    The file is complete before the path is returned, so every request given
+    the path (see app.utils.single_flight) can stream it from disk.
+    """
+    directory = _report_dir()
+    _remove_old_reports(directory)
+    output = tempfile.NamedTemporaryFile(dir=directory, prefix='report-', suffix='.xlsx', delete=False)
+    try:
+        with output:
+            write_excel_report(
+                report_case_rows(start_date, end_date, court_id),
+                report_activity_rows(start_date, end_date, court_id),
+                output
+            )
+    except Exception:
+        os.remove(output.name)
+        raise
+    return output.name
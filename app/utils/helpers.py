@@ -1,6 +1,7 @@
+from flask import current_app
 from flask_login import current_user
 from app.models.models import ActivityLog
-from extensions import db
+from extensions import db, sse
 
 def log_activity(action, details=None, case_id=None, court_id=None):
     try:
@@ -16,3 +17,11 @@ def log_activity(action, details=None, case_id=None, court_id=None):
     except Exception as e:
         print(f"Error logging activity: {e}")
         db.session.rollback()
+
+def publish_display_update(payload):
+    if not current_app.config.get('SSE_ENABLED'):
+        return
+    try:
+        sse.publish(payload, type='display_update')
+    except Exception as sse_error:
+        print(f"Warning: Failed to publish SSE event: {sse_error}")
@@ -2,6 +2,9 @@ import os
 import json
 from datetime import datetime
 from app.models.models import Case, CaseStatus
+from app.utils.cache import invalidate_court
+from app.utils.case_index import index_cases_added
+from app.utils.sequences import allocate_case_orders, reserve_case_orders_through
 
 class JsonToDatabase:
     def __init__(self, db_session, court_id, json_storage_path):
@@ -32,6 +35,10 @@ class JsonToDatabase:
         cases_added_count = 0
         skipped_cases = []
         errors = []
+        # New cases without an order get one block from the court's sequence at the end
+        unordered_cases = []
+        new_cases = []
+        highest_explicit_order = 0
 
         if not case_data_list:
             errors.append("No data found in the JSON file to import.")
@@ -156,11 +163,12 @@ class JsonToDatabase:
                     status_enum = CaseStatus.inactive # Default to inactive
 
                 # Get integer fields with defaults and error handling
-                try:
-                    c_order = int(record.get('c_order', 9999)) # Default order if missing
-                except (ValueError, TypeError):
-                     errors.append(f"Row {row_num} (Case# {case_number}): Invalid c_order value. Using default 9999.")
-                     c_order = 9999
+                c_order = None
+                if record.get('c_order') not in (None, ''):
+                    try:
+                        c_order = int(record.get('c_order'))
+                    except (ValueError, TypeError):
+                         errors.append(f"Row {row_num} (Case# {case_number}): Invalid c_order value. Assigning the next available order.")
 
                 try:
                     num_sessions = int(record.get('num_sessions', 1)) # Default 1 if missing
@@ -213,7 +221,12 @@ class JsonToDatabase:
                     status=status_enum, # Use validated enum
                     # added_date is handled by default in model
                 )
-                self.db.add(new_case)
+                new_cases.append(new_case)
+                if c_order is None:
+                    unordered_cases.append(new_case) # Added once its order is allocated
+                else:
+                    highest_explicit_order = max(highest_explicit_order, c_order)
+                    self.db.add(new_case)
                 cases_added_count += 1
                 # Add the new case number to our set to prevent duplicates *within the same file*
                 existing_case_numbers.add(str(case_number))
@@ -235,7 +248,18 @@ class JsonToDatabase:
                 # self.db.rollback() # Option: Rollback per record error
 
         try:
+            if highest_explicit_order:
+                reserve_case_orders_through(self.court_id, highest_explicit_order, session=self.db)
+            if unordered_cases:
+                first_order = allocate_case_orders(self.court_id, len(unordered_cases), session=self.db)
+                for offset, new_case in enumerate(unordered_cases):
+                    new_case.c_order = first_order + offset
+                self.db.add_all(unordered_cases)
+            self.db.flush()
+            new_rows = [(new_case.id, new_case.case_number) for new_case in new_cases]
             self.db.commit()
+            index_cases_added(self.court_id, new_rows)
+            invalidate_court(self.court_id)
             return {
                 'success': True,
                 'cases_added': cases_added_count,
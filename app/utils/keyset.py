@@ -0,0 +1,77 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from sqlalchemy import and_, false, or_, true
+
+
+class SortKey:
+    """One column of a keyset ordering, with its direction and where its NULLs go."""
+
+    def __init__(self, column, descending=False, nulls_last=True):
+        self.column = column
+        self.descending = descending
+        self.nulls_last = nulls_last
+
+    @property
+    def name(self):
+        return self.column.key
+
+    def order_by(self):
+        clause = self.column.desc() if self.descending else self.column.asc()
+        if not self.column.nullable:
+            return clause
+        return clause.nullslast() if self.nulls_last else clause.nullsfirst()
+
+    def equals(self, value):
+        return self.column.is_(None) if value is None else self.column == value
+
+    def after(self, value):
+        """Rows sorted strictly after ``value`` in this column."""
+        if value is None:
+            return false() if self.nulls_last else self.column.isnot(None)
+        beyond = self.column < value if self.descending else self.column > value
+        if self.column.nullable and self.nulls_last:
+            return or_(beyond, self.column.is_(None))
+        return beyond
+
+    def parse(self, value):
+        if value is None:
+            return None
+        python_type = self.column.type.python_type
+        if python_type is datetime:
+            return datetime.fromisoformat(value)
+        if python_type is date:
+            return date.fromisoformat(value)
+        return python_type(value)
+
+
+def after_condition(sort_keys, values):
+    """WHERE clause selecting the rows that come after ``values`` in the ``sort_keys`` ordering."""
+    clauses = []
+    for position, key in enumerate(sort_keys):
+        equal = [sort_keys[i].equals(values[i]) for i in range(position)]
+        clauses.append(and_(true(), *equal, key.after(values[position])))
+    return or_(*clauses)
+
+
+def _json_value(value):
+    return value.isoformat() if isinstance(value, (date, datetime)) else value
+
+
+def encode_cursor(sort_keys, row):
+    """Opaque cursor of the ``sort_keys`` values of ``row`` (a result row or a mapping)."""
+    row = getattr(row, '_mapping', row)
+    values = [_json_value(row[key.name]) for key in sort_keys]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+
+def decode_cursor(sort_keys, cursor):
+    """Values of an encode_cursor() cursor; raises ValueError when it does not fit ``sort_keys``."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(sort_keys):
+            raise ValueError('Cursor does not match the sort order')
+        return [key.parse(value) for key, value in zip(sort_keys, values)]
+    except (binascii.Error, TypeError, UnicodeDecodeError) as e:
+        raise ValueError(f'Invalid cursor: {e}')
@@ -0,0 +1,81 @@
+from sqlalchemy import select
+from app.models.models import Case, Court, DisplayCase, User
+from app.utils.keyset import SortKey, after_condition, decode_cursor, encode_cursor
+from extensions import db
+
+# Columns the case listings (cases, court_cases) actually render
+CASE_LIST_COLUMNS = (
+    Case.id, Case.case_number, Case.case_date, Case.next_session_date, Case.case_subject,
+    Case.plaintiff, Case.defendant, Case.status, Case.c_order, Case.court_id, Case.user_id
+)
+
+
+# Orderings of the paginated court cases page; each ends on the primary key so
+# that every row has a distinct cursor
+CASE_PAGE_SORTS = {
+    'newest': (SortKey(Case.case_date, descending=True), SortKey(Case.c_order), SortKey(Case.id)),
+    'oldest': (SortKey(Case.case_date), SortKey(Case.c_order), SortKey(Case.id)),
+    'number': (
+        SortKey(Case.case_prefix, nulls_last=False), SortKey(Case.case_year), SortKey(Case.case_serial),
+        SortKey(Case.case_number), SortKey(Case.id)
+    ),
+    'c_order': (SortKey(Case.c_order), SortKey(Case.id)),
+}
+CASE_PAGE_SIZE = 50
+MAX_CASE_PAGE_SIZE = 200
+
+
+def _case_list_query(query, extra_columns=()):
+    listed = {column.key for column in CASE_LIST_COLUMNS}
+    columns = list(CASE_LIST_COLUMNS) + [column for column in extra_columns if column.key not in listed]
+    return (
+        query.outerjoin(Court, Case.court_id == Court.id)
+        .outerjoin(User, Case.user_id == User.id)
+        .with_entities(*columns, Court.name.label('court_name'), User.name.label('user_name'))
+    )
+
+
+def case_list_rows(query):
+    """Run a filtered/ordered ``Case`` query as lightweight rows for listing pages.
+
+    Only CASE_LIST_COLUMNS are fetched, with ``court_name`` and ``user_name``
+    joined in; the result is a list of read-only named tuples instead of
+    tracked ORM instances.
+    """
+    return _case_list_query(query).all()
+
+
+def case_list_page(query, sort='newest', cursor=None, limit=CASE_PAGE_SIZE):
+    """One keyset page of a filtered ``Case`` query, as case_list_rows() rows.
+
+    ``cursor`` is the ``next_cursor`` of the previous page; a malformed one
+    raises ValueError. Returns ``(rows, next_cursor)``, next_cursor being
+    None on the last page.
+    """
+    sort_keys = CASE_PAGE_SORTS[sort]
+    if cursor:
+        query = query.filter(after_condition(sort_keys, decode_cursor(sort_keys, cursor)))
+    rows = (
+        _case_list_query(query, [key.column for key in sort_keys])
+        .order_by(*[key.order_by() for key in sort_keys])
+        .limit(limit + 1)
+        .all()
+    )
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(sort_keys, rows[-1])
+
+
+def display_entry_rows(court_id):
+    """Display board entries of a court with their case columns, in board order."""
+    stmt = (
+        select(
+            DisplayCase.id, DisplayCase.case_id, DisplayCase.display_order, DisplayCase.custom_order,
+            Case.case_number, Case.case_subject, Case.status
+        )
+        .join(Case, DisplayCase.case_id == Case.id)
+        .where(Case.court_id == court_id)
+        .order_by(DisplayCase.custom_order.asc().nullsfirst(), DisplayCase.display_order.asc())
+    )
+    return db.session.execute(stmt).all()
@@ -0,0 +1,227 @@
+from collections import defaultdict
+from datetime import date, datetime
+from sqlalchemy import case, delete, event, func, insert, inspect, literal, select, union_all, update
+from sqlalchemy.orm import Session
+from flask import has_request_context
+from flask_login import current_user
+from app.models.models import Case, CaseStatus, CaseStatusChange, CaseStatusRollup, CourtDailyRollup
+from extensions import db
+
+DAILY_COUNTERS = ('new_cases', 'finished_cases', 'postponed_cases', 'status_changes')
+
+# Keeps each IN (...) list well below SQLite's bound-parameter limit
+CHUNK_SIZE = 500
+
+
+def _matches(column, value):
+    return column.is_(None) if value is None else column == value
+
+
+def _as_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    return value
+
+
+class RollupChanges:
+    """Deltas to the rollup tables and new status history rows, collected while cases change and applied in one go."""
+
+    def __init__(self):
+        self.status_counts = defaultdict(int)
+        self.daily = defaultdict(lambda: defaultdict(int))
+        self.status_changes = []
+        self.removed_case_ids = []
+
+    def __bool__(self):
+        return bool(self.status_counts or self.daily or self.status_changes or self.removed_case_ids)
+
+    def case_added(self, court_id, case_date, status, added_date=None):
+        self.status_counts[(court_id, case_date, status)] += 1
+        self.daily[(court_id, _as_date(added_date or datetime.utcnow()))]['new_cases'] += 1
+
+    def case_removed(self, court_id, case_date, status, case_id=None):
+        self.status_counts[(court_id, case_date, status)] -= 1
+        if case_id is not None:
+            self.removed_case_ids.append(case_id)
+
+    def case_changed(self, old_key, new_key, changed_at=None, case_id=None, user_id=None):
+        """``old_key``/``new_key`` are ``(court_id, case_date, status)`` before and after the change.
+
+        A status change is also written to tblcase_status_change.
+        """
+        if old_key == new_key:
+            return
+        self.status_counts[old_key] -= 1
+        self.status_counts[new_key] += 1
+        old_status, new_status = old_key[2], new_key[2]
+        if old_status != new_status:
+            changed_at = changed_at or datetime.utcnow()
+            self.status_changes.append({
+                'case_id': case_id,
+                'court_id': new_key[0],
+                'from_status': old_status,
+                'to_status': new_status,
+                'changed_at': changed_at,
+                'user_id': user_id
+            })
+            counters = self.daily[(new_key[0], _as_date(changed_at))]
+            counters['status_changes'] += 1
+            if new_status == CaseStatus.finished:
+                counters['finished_cases'] += 1
+            elif new_status == CaseStatus.postponed:
+                counters['postponed_cases'] += 1
+
+    def apply(self, connection):
+        """Add the deltas to the rollup rows, inserting the rows that do not exist yet.
+
+        Two transactions may both insert the same key; readers always SUM the
+        rows, so a duplicate only costs a row until the next rebuild.
+        """
+        status_table = CaseStatusRollup.__table__
+        for (court_id, case_date, status), delta in self.status_counts.items():
+            if not delta:
+                continue
+            updated = connection.execute(
+                update(status_table)
+                .where(
+                    _matches(status_table.c.court_id, court_id),
+                    _matches(status_table.c.case_date, case_date),
+                    _matches(status_table.c.status, status)
+                )
+                .values(case_count=status_table.c.case_count + delta)
+            ).rowcount
+            if not updated:
+                connection.execute(insert(status_table).values(
+                    court_id=court_id, case_date=case_date, status=status, case_count=delta
+                ))
+
+        daily_table = CourtDailyRollup.__table__
+        for (court_id, day), counters in self.daily.items():
+            counters = {name: counters.get(name, 0) for name in DAILY_COUNTERS}
+            if not any(counters.values()):
+                continue
+            updated = connection.execute(
+                update(daily_table)
+                .where(_matches(daily_table.c.court_id, court_id), daily_table.c.day == day)
+                .values({name: daily_table.c[name] + delta for name, delta in counters.items()})
+            ).rowcount
+            if not updated:
+                connection.execute(insert(daily_table).values(court_id=court_id, day=day, **counters))
+
+        if self.status_changes:
+            connection.execute(insert(CaseStatusChange.__table__), self.status_changes)
+        # The history outlives its cases; detach it so a reused id cannot claim it
+        history_table = CaseStatusChange.__table__
+        for start in range(0, len(self.removed_case_ids), CHUNK_SIZE):
+            connection.execute(
+                update(history_table)
+                .where(history_table.c.case_id.in_(self.removed_case_ids[start:start + CHUNK_SIZE]))
+                .values(case_id=None)
+            )
+
+        self.status_counts.clear()
+        self.daily.clear()
+        self.status_changes = []
+        self.removed_case_ids = []
+
+
+def _committed(state, key):
+    """Value of an attribute as last loaded from (or flushed to) the database."""
+    history = state.attrs[key].load_history()
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return None
+
+
+def _rollup_key(case_obj):
+    return case_obj.court_id, case_obj.case_date, case_obj.status
+
+
+def _current_user_id():
+    if has_request_context() and current_user.is_authenticated:
+        return current_user.id
+    return None
+
+
+@event.listens_for(Session, 'before_flush')
+def _collect_case_changes(session, flush_context, instances):
+    """Keep the rollups and status history in step with every case inserted, changed or deleted through the ORM.
+
+    Core statements (app.utils.bulk_cases) bypass the flush and record their
+    own changes.
+    """
+    changes = RollupChanges()
+    user_id = _current_user_id()
+    for obj in session.new:
+        if isinstance(obj, Case):
+            status = obj.status if obj.status is not None else CaseStatus.inactive
+            changes.case_added(obj.court_id, obj.case_date, status, obj.added_date)
+    for obj in session.dirty:
+        if isinstance(obj, Case) and session.is_modified(obj):
+            state = inspect(obj)
+            old_key = tuple(_committed(state, key) for key in ('court_id', 'case_date', 'status'))
+            changes.case_changed(old_key, _rollup_key(obj), case_id=obj.id, user_id=user_id)
+    for obj in session.deleted:
+        if isinstance(obj, Case):
+            state = inspect(obj)
+            changes.case_removed(
+                *(_committed(state, key) for key in ('court_id', 'case_date', 'status')), case_id=obj.id
+            )
+    if changes:
+        changes.apply(session.connection())
+
+
+def _daily_events():
+    """One row per dated event (case added, status change) with its counter increments."""
+    new_cases = select(
+        Case.court_id.label('court_id'),
+        func.date(Case.added_date).label('day'),
+        literal(1).label('new_cases'),
+        literal(0).label('finished_cases'),
+        literal(0).label('postponed_cases'),
+        literal(0).label('status_changes')
+    ).where(Case.added_date.isnot(None))
+    status_changes = select(
+        CaseStatusChange.court_id,
+        func.date(CaseStatusChange.changed_at),
+        literal(0),
+        case((CaseStatusChange.to_status == CaseStatus.finished, 1), else_=0),
+        case((CaseStatusChange.to_status == CaseStatus.postponed, 1), else_=0),
+        literal(1)
+    )
+    return union_all(new_cases, status_changes).subquery('events')
+
+
+def rebuild_rollups(session=None):
+    """Recompute both rollup tables from tblcase and tblcase_status_change (backfill/repair).
+
+    Returns the number of rows written.
+    """
+    session = session or db.session
+    session.execute(delete(CaseStatusRollup))
+    session.execute(delete(CourtDailyRollup))
+
+    written = session.execute(
+        insert(CaseStatusRollup).from_select(
+            ['court_id', 'case_date', 'status', 'case_count'],
+            select(Case.court_id, Case.case_date, Case.status, func.count(Case.id))
+            .group_by(Case.court_id, Case.case_date, Case.status)
+        )
+    ).rowcount
+
+    events = _daily_events()
+    written += session.execute(
+        insert(CourtDailyRollup).from_select(
+            ['court_id', 'day', *DAILY_COUNTERS],
+            select(
+                events.c.court_id,
+                events.c.day,
+                *[func.sum(events.c[name]) for name in DAILY_COUNTERS]
+            ).group_by(events.c.court_id, events.c.day)
+        )
+    ).rowcount
+    return written
@@ -0,0 +1,101 @@
+from sqlalchemy import bindparam, case, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from app.models.models import Case, CourtSequence
+from extensions import db
+
+_MAX_ORDER = 2 ** 31 - 1
+
+
+def _seed_sequence(session, court_id):
+    highest = session.query(db.func.max(Case.c_order)).filter(Case.court_id == court_id).scalar() or 0
+    try:
+        with session.begin_nested():
+            session.execute(insert(CourtSequence).values(court_id=court_id, last_order=highest))
+    except IntegrityError:
+        pass  # Seeded concurrently by another transaction
+
+
+def _increment(session, court_id, count):
+    stmt = (
+        update(CourtSequence)
+        .where(CourtSequence.court_id == court_id)
+        .values(last_order=CourtSequence.last_order + count)
+    )
+    if session.get_bind().dialect.update_returning:
+        return session.execute(stmt.returning(CourtSequence.last_order)).scalar()
+    # The UPDATE holds the row lock until commit, so reading it back is safe
+    if session.execute(stmt).rowcount == 0:
+        return None
+    return session.execute(
+        select(CourtSequence.last_order).where(CourtSequence.court_id == court_id)
+    ).scalar()
+
+
+def allocate_case_orders(court_id, count=1, session=None):
+    """Reserve ``count`` consecutive ``c_order`` values for a court and return the first.
+
+    The counter is bumped with a single atomic UPDATE in the caller's
+    transaction, so concurrent inserts never receive the same order and a
+    rollback gives the block back.
+    """
+    session = session or db.session
+    last_order = _increment(session, court_id, count)
+    if last_order is None:
+        _seed_sequence(session, court_id)
+        last_order = _increment(session, court_id, count)
+    return last_order - count + 1
+
+
+def reserve_case_orders_through(court_id, highest, session=None):
+    """Make sure the court's counter is at least ``highest`` (e.g. after explicit imported orders)."""
+    session = session or db.session
+    session.execute(
+        update(CourtSequence)
+        .where(CourtSequence.court_id == court_id)
+        .values(last_order=case(
+            (CourtSequence.last_order < highest, highest),
+            else_=CourtSequence.last_order
+        ))
+    )
+
+
+def close_case_order_gaps(deleted_orders, session=None):
+    """Move later cases down after deletions, as if rows were removed from a numbered list.
+
+    ``deleted_orders`` maps a court_id to the ``c_order`` values deleted from it.
+    Each remaining case moves down by the number of deleted orders below its
+    own. That is one range UPDATE per deleted order, sent as a single
+    executemany, and each remaining row is written at most once.
+    """
+    session = session or db.session
+    tblcase = Case.__table__
+    shifts = []
+    for court_id, orders in deleted_orders.items():
+        orders = sorted(orders)
+        upper_bounds = orders[1:] + [_MAX_ORDER]
+        for shift, (low, high) in enumerate(zip(orders, upper_bounds), start=1):
+            if low < high:
+                shifts.append({'court': court_id, 'low': low, 'high': high, 'shift': shift})
+    if not shifts:
+        return
+
+    # Lower the counters first: the UPDATE holds each sequence row until
+    # commit, so a concurrent allocate_case_orders() waits for the shifted
+    # orders instead of taking one that is about to be reused
+    unseeded = []
+    for court_id in sorted(deleted_orders):
+        if _increment(session, court_id, -len(deleted_orders[court_id])) is None:
+            unseeded.append(court_id)
+
+    session.execute(
+        tblcase.update()
+        .where(
+            tblcase.c.court_id == bindparam('court'),
+            tblcase.c.c_order > bindparam('low'),
+            tblcase.c.c_order <= bindparam('high')
+        )
+        .values(c_order=tblcase.c.c_order - bindparam('shift')),
+        shifts
+    )
+    for court_id in unseeded:
+        _seed_sequence(session, court_id)
@@ -0,0 +1,40 @@
+import calendar
+from datetime import date
+from app.models.models import Case
+from app.utils.cache import cache
+from extensions import db
+
+CALENDAR_CACHE_TTL = 600
+
+
+def month_bounds(year, month):
+    """Return the first and last day of a calendar month."""
+    last_day = calendar.monthrange(year, month)[1]
+    return date(year, month, 1), date(year, month, last_day)
+
+
+def _query_session_counts(court_id, year, month):
+    first_day, last_day = month_bounds(year, month)
+    rows = (
+        db.session.query(Case.session_date, db.func.count(Case.id))
+        .filter(
+            Case.court_id == court_id,
+            Case.session_date.between(first_day, last_day)
+        )
+        .group_by(Case.session_date)
+        .all()
+    )
+    return {session_date.isoformat(): count for session_date, count in rows}
+
+
+def session_counts_for_month(court_id, year, month, ttl=CALENDAR_CACHE_TTL):
+    """Per-day session counts of a court for one month, keyed by ISO date.
+
+    Counts come from a single grouped query on ``Case.session_date`` and are
+    cached per (court, month) until the court's cases change.
+    """
+    return cache.get_or_set(
+        ('session_calendar', court_id, year, month),
+        lambda: _query_session_counts(court_id, year, month),
+        ttl=ttl
+    )
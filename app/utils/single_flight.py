@@ -0,0 +1,192 @@
+import os
+import threading
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from flask import current_app, json
+from sqlalchemy import delete, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from app.models.models import ComputationLock
+from app.utils.cache import cache, data_version
+from extensions import db
+
+POLL_INTERVAL = 0.2
+
+_MISSING = object()
+
+# Prefix of this process's claims in tblcomputation_lock
+_OWNER_PREFIX = f'{os.getpid()}-{uuid.uuid4().hex[:8]}'
+
+
+class _Flight:
+    """A computation in progress that other threads of this worker wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+_flights = {}
+_flights_lock = threading.Lock()
+
+
+def flight_key(endpoint, **filters):
+    """Key of ``endpoint`` with its filters normalized: empty values dropped, names sorted, dates in ISO form."""
+    parts = []
+    for name in sorted(filters):
+        value = filters[name]
+        if value is None or value == '':
+            continue
+        if isinstance(value, (date, datetime)):
+            value = value.isoformat()
+        parts.append(f'{name}={value}')
+    return f"{endpoint}?{'&'.join(parts)}"
+
+
+def encode_json(value):
+    return json.dumps(value).encode('utf-8')
+
+
+def decode_json(payload):
+    return json.loads(payload.decode('utf-8'))
+
+
+# The lock rows are read and written on their own connections, so that
+# claiming or releasing a computation never commits or rolls back the
+# caller's db.session.
+
+def _stored_result(key):
+    with db.engine.connect() as conn:
+        row = conn.execute(
+            select(ComputationLock.payload, ComputationLock.expires_at).where(ComputationLock.key == key)
+        ).first()
+    if row and row.payload is not None and row.expires_at and row.expires_at > datetime.utcnow():
+        return row.payload
+    return None
+
+
+def _claim(key, owner, timeout):
+    """Take the cross-worker lock of ``key`` unless another live owner holds it."""
+    now = datetime.utcnow()
+    locked_until = now + timedelta(seconds=timeout)
+    try:
+        with db.engine.begin() as conn:
+            conn.execute(insert(ComputationLock).values(key=key, owner=owner, locked_until=locked_until))
+        return True
+    except IntegrityError:
+        pass
+    with db.engine.begin() as conn:
+        return conn.execute(
+            update(ComputationLock)
+            .where(
+                ComputationLock.key == key,
+                or_(ComputationLock.locked_until.is_(None), ComputationLock.locked_until < now)
+            )
+            .values(owner=owner, locked_until=locked_until, payload=None, expires_at=None)
+        ).rowcount == 1
+
+
+def _finish(key, owner, payload=None, ttl=0):
+    """Release the lock of ``key``, storing ``payload`` for other workers when it is small enough."""
+    now = datetime.utcnow()
+    values = {'owner': None, 'locked_until': None}
+    if payload is not None and len(payload) <= current_app.config.get('SINGLE_FLIGHT_MAX_PAYLOAD', 1024 * 1024):
+        values.update(payload=payload, expires_at=now + timedelta(seconds=ttl))
+    try:
+        with db.engine.begin() as conn:
+            conn.execute(
+                update(ComputationLock)
+                .where(ComputationLock.key == key, ComputationLock.owner == owner)
+                .values(**values)
+            )
+            # Drop released results nobody can read any more
+            conn.execute(
+                delete(ComputationLock).where(
+                    ComputationLock.locked_until.is_(None),
+                    or_(ComputationLock.expires_at.is_(None), ComputationLock.expires_at < now)
+                )
+            )
+    except SQLAlchemyError as e:
+        print(f"Warning: Could not release computation '{key}': {e}")
+
+
+def _shared_computation(key, compute, ttl, encode, decode):
+    """Compute under the cross-worker lock of ``key``, or pick up the result another worker stored."""
+    timeout = current_app.config.get('SINGLE_FLIGHT_TIMEOUT', 120)
+    owner = f'{_OWNER_PREFIX}-{threading.get_ident()}'
+    deadline = time.monotonic() + timeout
+    try:
+        while True:
+            payload = _stored_result(key)
+            if payload is not None:
+                return decode(payload), 'shared'
+            if _claim(key, owner, timeout):
+                break
+            if time.monotonic() >= deadline:
+                # The other worker is stuck; compute without the lock
+                owner = None
+                break
+            time.sleep(POLL_INTERVAL)
+    except SQLAlchemyError as e:
+        print(f"Warning: Could not coordinate computation '{key}' across workers: {e}")
+        owner = None
+
+    try:
+        value = compute()
+    except Exception:
+        if owner:
+            _finish(key, owner)
+        raise
+    if owner:
+        _finish(key, owner, encode(value), ttl)
+    return value, 'computed'
+
+
+def single_flight(key, compute, ttl, court_id=None, encode=encode_json, decode=decode_json):
+    """Run ``compute()`` once for all concurrent callers of ``key`` and cache the result for ``ttl`` seconds.
+
+    Other threads of this worker wait for the first caller's result. Other
+    workers wait on its claim in tblcomputation_lock and then read the
+    result stored there (``encode``/``decode`` turn it into bytes and back).
+    ``key`` is extended with the data_version() of ``court_id`` (of every
+    court when None), so no worker reuses a result computed before the
+    court's data last changed. Returns ``(value, source)``, source being
+    'cache', 'waited', 'shared' or 'computed'.
+    """
+    try:
+        key = f'{key}@{data_version(court_id)}'
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        print(f"Warning: Could not read the data version for '{key}': {e}")
+        return compute(), 'computed'
+    cache_key = ('single_flight', court_id, key)
+    value = cache.get(cache_key, _MISSING)
+    if value is not _MISSING:
+        return value, 'cache'
+
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+
+    if not leader:
+        if not flight.done.wait(current_app.config.get('SINGLE_FLIGHT_TIMEOUT', 120)):
+            return compute(), 'computed'
+        if flight.error is not None:
+            raise flight.error
+        return flight.value, 'waited'
+
+    try:
+        value, source = _shared_computation(key, compute, ttl, encode, decode)
+        cache.set(cache_key, value, ttl=ttl)
+        flight.value = value
+        return value, source
+    except Exception as e:
+        flight.error = e
+        raise
+    finally:
+        with _flights_lock:
+            _flights.pop(key, None)
+        flight.done.set()
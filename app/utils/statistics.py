@@ -0,0 +1,296 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from sqlalchemy import extract, func, select
+from app.models.models import (
+    ActivityLog, Case, CaseStatus, CaseStatusChange, CaseStatusRollup, Court, CourtDailyRollup, User
+)
+from app.utils.analytics import duration_percentiles
+from app.utils.single_flight import flight_key, single_flight
+from extensions import db
+
+
+def rollup_filters(start_date=None, end_date=None, court_id=None):
+    """WHERE conditions on the case status rollup for the statistics page filters."""
+    conditions = []
+    if start_date:
+        conditions.append(CaseStatusRollup.case_date >= start_date)
+    if end_date:
+        conditions.append(CaseStatusRollup.case_date <= end_date)
+    if court_id:
+        conditions.append(CaseStatusRollup.court_id == court_id)
+    return conditions
+
+
+def recent_months(count, today=None):
+    """The last ``count`` calendar months as ``(year, month)`` pairs, oldest first."""
+    today = today or datetime.now().date()
+    months = []
+    year, month = today.year, today.month
+    for _ in range(count):
+        months.append((year, month))
+        year, month = (year - 1, 12) if month == 1 else (year, month - 1)
+    return months[::-1]
+
+
+def monthly_trends(count=12, today=None):
+    """Labels, new-case counts and finished-case counts of the last ``count`` calendar months.
+
+    Both series come from one query over the daily rollup, grouped by year
+    and month.
+    """
+    months = recent_months(count, today)
+    (first_year, first_month), (last_year, last_month) = months[0], months[-1]
+    start = date(first_year, first_month, 1)
+    end = date(last_year + 1, 1, 1) if last_month == 12 else date(last_year, last_month + 1, 1)
+    year, month = extract('year', CourtDailyRollup.day), extract('month', CourtDailyRollup.day)
+    stmt = (
+        select(year, month, func.sum(CourtDailyRollup.new_cases), func.sum(CourtDailyRollup.finished_cases))
+        .where(CourtDailyRollup.day >= start, CourtDailyRollup.day < end)
+        .group_by(year, month)
+    )
+    totals = {(int(y), int(m)): (new, finished) for y, m, new, finished in db.session.execute(stmt)}
+    labels = [f'{year}-{month:02d}' for year, month in months]
+    return (
+        labels,
+        [totals.get(month, (0, 0))[0] for month in months],
+        [totals.get(month, (0, 0))[1] for month in months]
+    )
+
+
+def court_status_counts(conditions):
+    """``{court_id: {CaseStatus: count}}`` of the matching cases, summed from the status rollup."""
+    stmt = (
+        select(CaseStatusRollup.court_id, CaseStatusRollup.status, func.sum(CaseStatusRollup.case_count))
+        .where(*conditions)
+        .group_by(CaseStatusRollup.court_id, CaseStatusRollup.status)
+    )
+    counts = defaultdict(dict)
+    for court_id, status, count in db.session.execute(stmt):
+        if count:
+            counts[court_id][status] = count
+    return counts
+
+
+def court_case_counts(court_id=None):
+    """``{court_id: {'total': n, <status name>: n}}`` of all cases, per court, from the status rollup."""
+    counts = {}
+    for court, by_status in court_status_counts(rollup_filters(court_id=court_id)).items():
+        counts[court] = {status.name: count for status, count in by_status.items()}
+        counts[court]['total'] = sum(by_status.values())
+    return counts
+
+
+def _as_date(value):
+    """``func.date()`` results come back as ISO strings on SQLite."""
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+
+def finished_case_durations(start_date=None, end_date=None, court_id=None):
+    """Average days from case date to finishing of each court's finished cases.
+
+    The finishing time is a case's latest change to ``finished`` in
+    tblcase_status_change; finished cases without one (e.g. imported as
+    finished) are left out. Rows are grouped by court, case date and finish
+    day, so Python only weighs those groups.
+    """
+    finished = (
+        select(CaseStatusChange.case_id, func.max(CaseStatusChange.changed_at).label('finished_at'))
+        .where(CaseStatusChange.to_status == CaseStatus.finished, CaseStatusChange.case_id.isnot(None))
+        .group_by(CaseStatusChange.case_id)
+        .subquery()
+    )
+    finish_day = func.date(finished.c.finished_at)
+    stmt = (
+        select(Case.court_id, Case.case_date, finish_day, func.count(Case.id))
+        .join(finished, finished.c.case_id == Case.id)
+        .where(Case.status == CaseStatus.finished, Case.case_date.isnot(None))
+        .group_by(Case.court_id, Case.case_date, finish_day)
+    )
+    if start_date:
+        stmt = stmt.where(Case.case_date >= start_date)
+    if end_date:
+        stmt = stmt.where(Case.case_date <= end_date)
+    if court_id:
+        stmt = stmt.where(Case.court_id == court_id)
+
+    totals = defaultdict(lambda: [0, 0])
+    for case_court_id, case_date, day, count in db.session.execute(stmt):
+        totals[case_court_id][0] += (_as_date(day) - case_date).days * count
+        totals[case_court_id][1] += count
+    return {key: round(days / count) for key, (days, count) in totals.items()}
+
+
+def daily_status_changes(since):
+    """Labels and counts of status changes per day since ``since``, oldest first."""
+    day = func.date(CaseStatusChange.changed_at)
+    rows = db.session.execute(
+        select(day, func.count(CaseStatusChange.id))
+        .where(CaseStatusChange.changed_at >= since)
+        .group_by(day)
+        .order_by(day)
+    ).all()
+    return [_as_date(value).isoformat() for value, _ in rows], [count for _, count in rows]
+
+
+def status_summary(counts_by_court):
+    """Totals per status over all courts of a court_status_counts() result."""
+    totals = defaultdict(int)
+    for counts in counts_by_court.values():
+        for status, count in counts.items():
+            totals[status] += count
+    return {
+        'total_cases': sum(totals.values()),
+        'active_cases': totals[CaseStatus.in_session],
+        'finished_cases': totals[CaseStatus.finished],
+        'postponed_cases': totals[CaseStatus.postponed],
+        'inactive_cases': totals[CaseStatus.inactive],
+    }
+
+
+def court_statistics(courts, counts_by_court, ages_by_court):
+    """Per-court rows of the statistics page from the precomputed aggregates."""
+    rows = []
+    for court in courts:
+        counts = counts_by_court.get(court.id, {})
+        total = sum(counts.values())
+        finished = counts.get(CaseStatus.finished, 0)
+        rows.append({
+            'court_name': court.name,
+            'total_cases': total,
+            'active_cases': counts.get(CaseStatus.in_session, 0),
+            'finished_cases': finished,
+            'postponed_cases': counts.get(CaseStatus.postponed, 0),
+            'completion_rate': round((finished / total * 100), 1) if total > 0 else 0,
+            'avg_duration': ages_by_court.get(court.id, 0)
+        })
+    return rows
+
+
+def user_statistics(start_date=None, end_date=None):
+    """Cases added and last activity of every user, from two grouped queries.
+
+    ``start_date``/``end_date`` bound the ``added_date`` of the counted cases.
+    """
+    added = select(Case.user_id, func.count(Case.id)).where(Case.user_id.isnot(None))
+    if start_date:
+        added = added.where(Case.added_date >= start_date)
+    if end_date:
+        added = added.where(Case.added_date <= end_date)
+    cases_added = dict(db.session.execute(added.group_by(Case.user_id)).all())
+    last_activity = dict(db.session.execute(
+        select(ActivityLog.user_id, func.max(ActivityLog.created_at))
+        .where(ActivityLog.user_id.isnot(None))
+        .group_by(ActivityLog.user_id)
+    ).all())
+
+    return [
+        {
+            'username': username,
+            'cases_added': cases_added.get(user_id, 0),
+            'last_activity': last_activity.get(user_id)
+        }
+        for user_id, username in db.session.execute(select(User.id, User.username).order_by(User.id))
+    ]
+
+
+def recent_activities(limit=10):
+    """The latest activity log entries as plain dicts."""
+    stmt = (
+        select(ActivityLog.created_at, ActivityLog.action, ActivityLog.details)
+        .order_by(ActivityLog.created_at.desc())
+        .limit(limit)
+    )
+    return [
+        {
+            'created_at': created_at.isoformat() if created_at else None,
+            'action': action,
+            'details': details
+        }
+        for created_at, action, details in db.session.execute(stmt)
+    ]
+
+
+# --- Statistics page panels ------------------------------------------------
+# Each panel of statistics.html is loaded from its own JSON endpoint. A panel
+# builder takes the page filters and returns JSON-ready data; concurrent
+# requests for the same panel and filters share one computation, whose result
+# is cached for STATISTICS_CACHE_TTL seconds (app.utils.single_flight).
+# Court-filtered entries are dropped with the court's other caches.
+
+STATISTICS_CACHE_TTL = 60
+
+
+def _summary_panel(start_date, end_date, court_id):
+    summary = status_summary(court_status_counts(rollup_filters(start_date, end_date, court_id)))
+    now = datetime.now()
+    summary.update({
+        'new_cases_this_month': Case.query.filter(
+            Case.added_date >= now.replace(day=1, hour=0, minute=0, second=0, microsecond=0),
+            Case.added_date <= now
+        ).count(),
+        'total_courts': Court.query.filter_by(is_active=True).count(),
+        'total_users': User.query.count(),
+    })
+    summary['status_distribution'] = [
+        summary['active_cases'],
+        summary['inactive_cases'],
+        summary['postponed_cases'],
+        summary['finished_cases']
+    ]
+    return summary
+
+
+def _trends_panel(start_date, end_date, court_id):
+    labels, new_cases, finished_cases = monthly_trends(12)
+    return {'labels': labels, 'new_cases': new_cases, 'finished_cases': finished_cases}
+
+
+def _status_changes_panel(start_date, end_date, court_id):
+    labels, counts = daily_status_changes(datetime.utcnow() - timedelta(days=30))
+    return {'labels': labels, 'counts': counts}
+
+
+def _courts_panel(start_date, end_date, court_id):
+    courts = Court.query.filter_by(is_active=True).order_by(Court.id).all()
+    counts_by_court = court_status_counts(rollup_filters(start_date, end_date, court_id))
+    return court_statistics(courts, counts_by_court, finished_case_durations(start_date, end_date, court_id))
+
+
+def _durations_panel(start_date, end_date, court_id):
+    return {
+        'courts': duration_percentiles('court', start_date, end_date, court_id),
+        'subjects': duration_percentiles('subject', start_date, end_date, court_id, limit=10)
+    }
+
+
+def _users_panel(start_date, end_date, court_id):
+    rows = user_statistics(start_date, end_date)
+    for row in rows:
+        row['last_activity'] = row['last_activity'].isoformat() if row['last_activity'] else None
+    return rows
+
+
+def _activities_panel(start_date, end_date, court_id):
+    return recent_activities()
+
+
+STATISTICS_PANELS = {
+    'summary': _summary_panel,
+    'trends': _trends_panel,
+    'status_changes': _status_changes_panel,
+    'courts': _courts_panel,
+    'durations': _durations_panel,
+    'users': _users_panel,
+    'activities': _activities_panel,
+}
+
+
+def statistics_panel(name, start_date=None, end_date=None, court_id=None):
+    """Return ``(data, source)`` for one statistics panel; ``source`` is as for single_flight()."""
+    key = flight_key(f'statistics.{name}', start_date=start_date, end_date=end_date, court_id=court_id)
+    return single_flight(
+        key,
+        lambda: STATISTICS_PANELS[name](start_date, end_date, court_id),
+        ttl=STATISTICS_CACHE_TTL,
+        court_id=court_id
+    )
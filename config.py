@@ -16,6 +16,17 @@ class Config:
     UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER') or 'uploads'
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max upload
     REDIS_URL = os.environ.get('REDIS_URL')
+    # Daily time (HH:MM) at which each worker precomputes cause lists; unset disables it
+    CAUSE_LIST_SCHEDULE = os.environ.get('CAUSE_LIST_SCHEDULE')
+    CAUSE_LIST_WORKERS = int(os.environ.get('CAUSE_LIST_WORKERS') or 4)
+    # Seconds between checks for cache invalidations made by other worker processes
+    CACHE_SYNC_INTERVAL = float(os.environ.get('CACHE_SYNC_INTERVAL') or 2)
+    # Longest a worker waits for (and holds) a shared computation of app.utils.single_flight
+    SINGLE_FLIGHT_TIMEOUT = float(os.environ.get('SINGLE_FLIGHT_TIMEOUT') or 120)
+    # Results larger than this (bytes) are only shared within the computing worker
+    SINGLE_FLIGHT_MAX_PAYLOAD = int(os.environ.get('SINGLE_FLIGHT_MAX_PAYLOAD') or 1024 * 1024)
+    # Directory shared by the workers for generated Excel reports (default: a folder in the system temp dir)
+    REPORT_CACHE_DIR = os.environ.get('REPORT_CACHE_DIR')
 
 
 class DevelopmentConfig(Config):
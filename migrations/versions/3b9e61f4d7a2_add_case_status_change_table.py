@@ -0,0 +1,96 @@
+"""add case status change table
+
+Revision ID: 3b9e61f4d7a2
+Revises: d85f3a6c2b19
+Create Date: 2026-10-18 20:03:51.227903
+
+"""
+import re
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b9e61f4d7a2'
+down_revision = 'd85f3a6c2b19'
+branch_labels = None
+depends_on = None
+
+# CaseStatus values as written in the activity log, mapped to the stored enum names
+_STATUS_NAMES = {
+    'active': 'active',
+    'inactive': 'inactive',
+    'finished': 'finished',
+    'postponed': 'postponed',
+    'in session': 'in_session',
+}
+_DETAILS = re.compile(r'^Changed status from (.*) to (.*)$')
+
+
+def upgrade():
+    op.create_table('tblcase_status_change',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('case_id', sa.Integer(), nullable=True),
+    sa.Column('court_id', sa.Integer(), nullable=True),
+    sa.Column('from_status', sa.Enum('active', 'inactive', 'finished', 'postponed', 'in_session', name='casestatus'), nullable=True),
+    sa.Column('to_status', sa.Enum('active', 'inactive', 'finished', 'postponed', 'in_session', name='casestatus'), nullable=True),
+    sa.Column('changed_at', sa.DateTime(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['case_id'], ['tblcase.id'], name='fk_status_change_case', ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['court_id'], ['tblcourt.id'], name='fk_status_change_court', ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['user_id'], ['tbluser.id'], name='fk_status_change_user', ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('tblcase_status_change', schema=None) as batch_op:
+        batch_op.create_index('ix_status_change_to_status_changed_at', ['to_status', 'changed_at'], unique=False)
+        batch_op.create_index('ix_status_change_court_changed_at', ['court_id', 'changed_at'], unique=False)
+        batch_op.create_index('ix_status_change_case_id', ['case_id'], unique=False)
+
+    # Backfill from the 'Status Changed' activity rows, the only history kept so far
+    bind = op.get_bind()
+    activity = sa.table(
+        'tblactivity_log',
+        sa.column('case_id', sa.Integer),
+        sa.column('court_id', sa.Integer),
+        sa.column('user_id', sa.Integer),
+        sa.column('action', sa.String),
+        sa.column('details', sa.Text),
+        sa.column('created_at', sa.DateTime),
+    )
+    case_ids = set(bind.execute(sa.text('SELECT id FROM tblcase')).scalars())
+    rows = []
+    for row in bind.execute(
+        sa.select(activity.c.case_id, activity.c.court_id, activity.c.user_id, activity.c.details, activity.c.created_at)
+        .where(activity.c.action == 'Status Changed', activity.c.created_at.isnot(None))
+    ):
+        match = _DETAILS.match(row.details or '')
+        if not match or match.group(2) not in _STATUS_NAMES:
+            continue
+        rows.append({
+            'case_id': row.case_id if row.case_id in case_ids else None,
+            'court_id': row.court_id,
+            'from_status': _STATUS_NAMES.get(match.group(1)),
+            'to_status': _STATUS_NAMES[match.group(2)],
+            'changed_at': row.created_at,
+            'user_id': row.user_id,
+        })
+    if rows:
+        status_change = sa.table(
+            'tblcase_status_change',
+            sa.column('case_id', sa.Integer),
+            sa.column('court_id', sa.Integer),
+            sa.column('from_status', sa.String),
+            sa.column('to_status', sa.String),
+            sa.column('changed_at', sa.DateTime),
+            sa.column('user_id', sa.Integer),
+        )
+        bind.execute(status_change.insert(), rows)
+
+
+def downgrade():
+    with op.batch_alter_table('tblcase_status_change', schema=None) as batch_op:
+        batch_op.drop_index('ix_status_change_case_id')
+        batch_op.drop_index('ix_status_change_court_changed_at')
+        batch_op.drop_index('ix_status_change_to_status_changed_at')
+
+    op.drop_table('tblcase_status_change')
@@ -0,0 +1,31 @@
+"""add computation lock table for single-flight statistics and reports
+
+Revision ID: 5c0f7a3e9b48
+Revises: 3b9e61f4d7a2
+Create Date: 2026-10-18 21:12:40.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c0f7a3e9b48'
+down_revision = '3b9e61f4d7a2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('tblcomputation_lock',
+    sa.Column('key', sa.String(length=255), nullable=False),
+    sa.Column('owner', sa.String(length=64), nullable=True),
+    sa.Column('locked_until', sa.DateTime(), nullable=True),
+    sa.Column('payload', sa.LargeBinary(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('key')
+    )
+
+
+def downgrade():
+    op.drop_table('tblcomputation_lock')
@@ -0,0 +1,37 @@
+"""add tblcase.updated_at and last-modified indexes
+
+Revision ID: 5d0f3c7a91e2
+Revises: 9408249ba715
+Create Date: 2026-10-18 14:02:51.402117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d0f3c7a91e2'
+down_revision = '9408249ba715'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('tblcase', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+        batch_op.create_index('ix_case_court_updated_at', ['court_id', 'updated_at'], unique=False)
+
+    # Existing rows were last touched no later than now; added_date is the best guess
+    op.execute('UPDATE tblcase SET updated_at = added_date')
+
+    with op.batch_alter_table('tblactivity_log', schema=None) as batch_op:
+        batch_op.create_index('ix_activity_court_created_at', ['court_id', 'created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('tblactivity_log', schema=None) as batch_op:
+        batch_op.drop_index('ix_activity_court_created_at')
+
+    with op.batch_alter_table('tblcase', schema=None) as batch_op:
+        batch_op.drop_index('ix_case_court_updated_at')
+        batch_op.drop_column('updated_at')
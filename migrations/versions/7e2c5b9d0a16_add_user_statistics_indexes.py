@@ -0,0 +1,32 @@
+"""add indexes for the per-user statistics
+
+Revision ID: 7e2c5b9d0a16
+Revises: a4b6e2d81c57
+Create Date: 2026-10-18 18:31:09.552147
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7e2c5b9d0a16'
+down_revision = 'a4b6e2d81c57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('tblcase', schema=None) as batch_op:
+        batch_op.create_index('ix_case_user_id', ['user_id'], unique=False)
+
+    with op.batch_alter_table('tblactivity_log', schema=None) as batch_op:
+        batch_op.create_index('ix_activity_user_created_at', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('tblactivity_log', schema=None) as batch_op:
+        batch_op.drop_index('ix_activity_user_created_at')
+
+    with op.batch_alter_table('tblcase', schema=None) as batch_op:
+        batch_op.drop_index('ix_case_user_id')
@@ -0,0 +1,26 @@
+"""add index for the paginated court cases page
+
+Revision ID: 8f3d1b6a2c75
+Revises: 5c0f7a3e9b48
+Create Date: 2026-10-18 22:04:51.227413
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8f3d1b6a2c75'
+down_revision = '5c0f7a3e9b48'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('tblcase', schema=None) as batch_op:
+        batch_op.create_index('ix_case_court_date_order', ['court_id', 'case_date', 'c_order'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('tblcase', schema=None) as batch_op:
+        batch_op.drop_index('ix_case_court_date_order')
@@ -0,0 +1,26 @@
+"""add (court_id, c_order) index on tblcase
+
+Revision ID: 9408249ba715
+Revises: b79278602d8e
+Create Date: 2026-10-18 11:21:07.935184
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9408249ba715'
+down_revision = 'b79278602d8e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('tblcase', schema=None) as batch_op:
+        batch_op.create_index('ix_case_court_order', ['court_id', 'c_order'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('tblcase', schema=None) as batch_op:
+        batch_op.drop_index('ix_case_court_order')
@@ -0,0 +1,32 @@
+"""add indexes for the statistics trend charts
+
+Revision ID: a4b6e2d81c57
+Revises: f1a7d92c4e30
+Create Date: 2026-10-18 18:02:44.316820
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4b6e2d81c57'
+down_revision = 'f1a7d92c4e30'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('tblcase', schema=None) as batch_op:
+        batch_op.create_index('ix_case_added_date', ['added_date'], unique=False)
+
+    with op.batch_alter_table('tblactivity_log', schema=None) as batch_op:
+        batch_op.create_index('ix_activity_action_created_at', ['action', 'created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('tblactivity_log', schema=None) as batch_op:
+        batch_op.drop_index('ix_activity_action_created_at')
+
+    with op.batch_alter_table('tblcase', schema=None) as batch_op:
+        batch_op.drop_index('ix_case_added_date')
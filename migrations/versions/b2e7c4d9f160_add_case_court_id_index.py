@@ -0,0 +1,26 @@
+"""add index for paging the cases API by id
+
+Revision ID: b2e7c4d9f160
+Revises: 8f3d1b6a2c75
+Create Date: 2026-10-18 23:10:36.904512
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b2e7c4d9f160'
+down_revision = '8f3d1b6a2c75'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('tblcase', schema=None) as batch_op:
+        batch_op.create_index('ix_case_court_id', ['court_id', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('tblcase', schema=None) as batch_op:
+        batch_op.drop_index('ix_case_court_id')
@@ -0,0 +1,34 @@
+"""add per-court c_order sequence table
+
+Revision ID: b79278602d8e
+Revises: e40615360ddb
+Create Date: 2026-10-18 10:48:13.602417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b79278602d8e'
+down_revision = 'e40615360ddb'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('tblcourt_sequence',
+    sa.Column('court_id', sa.Integer(), nullable=False),
+    sa.Column('last_order', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['court_id'], ['tblcourt.id'], name='fk_sequence_court', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('court_id')
+    )
+    # Start every court's counter at its current highest order
+    op.execute(
+        "INSERT INTO tblcourt_sequence (court_id, last_order) "
+        "SELECT court_id, MAX(c_order) FROM tblcase WHERE court_id IS NOT NULL GROUP BY court_id"
+    )
+
+
+def downgrade():
+    op.drop_table('tblcourt_sequence')
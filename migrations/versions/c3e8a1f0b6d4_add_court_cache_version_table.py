@@ -0,0 +1,29 @@
+"""add per-court cache version table
+
+Revision ID: c3e8a1f0b6d4
+Revises: 5d0f3c7a91e2
+Create Date: 2026-10-18 15:37:12.580214
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3e8a1f0b6d4'
+down_revision = '5d0f3c7a91e2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('tblcourt_cache_version',
+    sa.Column('court_id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['court_id'], ['tblcourt.id'], name='fk_cache_version_court', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('court_id')
+    )
+
+
+def downgrade():
+    op.drop_table('tblcourt_cache_version')
@@ -0,0 +1,72 @@
+"""add normalized case session date
+
+Revision ID: cfa1d4b605d2
+Revises: 26bc3a2b11fb
+Create Date: 2026-10-18 09:12:40.118230
+
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'cfa1d4b605d2'
+down_revision = '26bc3a2b11fb'
+branch_labels = None
+depends_on = None
+
+
+def _parse_session_date(value):
+    # Same rules as app.models.models.parse_session_date, frozen for this migration
+    if not value:
+        return None
+    text = str(value).strip()
+    try:
+        return datetime.fromisoformat(text).date()
+    except ValueError:
+        pass
+    head = text.split()[0] if text else ''
+    for fmt in ('%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y', '%Y/%m/%d'):
+        try:
+            return datetime.strptime(head, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def upgrade():
+    with op.batch_alter_table('tblcase', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('session_date', sa.Date(), nullable=True))
+        batch_op.create_index('ix_case_court_session_date', ['court_id', 'session_date'], unique=False)
+
+    # Backfill from the free-text next_session_date column
+    bind = op.get_bind()
+    tblcase = sa.table(
+        'tblcase',
+        sa.column('id', sa.Integer),
+        sa.column('next_session_date', sa.String),
+        sa.column('session_date', sa.Date),
+    )
+    rows = bind.execute(
+        sa.select(tblcase.c.id, tblcase.c.next_session_date)
+        .where(tblcase.c.next_session_date.isnot(None))
+    ).fetchall()
+    updates = [
+        {'case_id': row.id, 'session_date': parsed}
+        for row in rows
+        if (parsed := _parse_session_date(row.next_session_date)) is not None
+    ]
+    if updates:
+        bind.execute(
+            tblcase.update()
+            .where(tblcase.c.id == sa.bindparam('case_id'))
+            .values(session_date=sa.bindparam('session_date')),
+            updates
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('tblcase', schema=None) as batch_op:
+        batch_op.drop_index('ix_case_court_session_date')
+        batch_op.drop_column('session_date')
@@ -0,0 +1,77 @@
+"""add statistics rollup tables
+
+Revision ID: d85f3a6c2b19
+Revises: 7e2c5b9d0a16
+Create Date: 2026-10-18 19:12:37.804415
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd85f3a6c2b19'
+down_revision = '7e2c5b9d0a16'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('tblcase_status_rollup',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('court_id', sa.Integer(), nullable=True),
+    sa.Column('case_date', sa.Date(), nullable=True),
+    sa.Column('status', sa.Enum('active', 'inactive', 'finished', 'postponed', 'in_session', name='casestatus'), nullable=True),
+    sa.Column('case_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['court_id'], ['tblcourt.id'], name='fk_status_rollup_court', ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('tblcase_status_rollup', schema=None) as batch_op:
+        batch_op.create_index('ix_status_rollup_court_date', ['court_id', 'case_date'], unique=False)
+
+    op.create_table('tblcourt_daily_rollup',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('court_id', sa.Integer(), nullable=True),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('new_cases', sa.Integer(), nullable=False),
+    sa.Column('finished_cases', sa.Integer(), nullable=False),
+    sa.Column('postponed_cases', sa.Integer(), nullable=False),
+    sa.Column('status_changes', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['court_id'], ['tblcourt.id'], name='fk_daily_rollup_court', ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('tblcourt_daily_rollup', schema=None) as batch_op:
+        batch_op.create_index('ix_daily_rollup_day_court', ['day', 'court_id'], unique=False)
+
+    # Backfill; same as `flask rebuild-statistics`
+    op.execute(
+        "INSERT INTO tblcase_status_rollup (court_id, case_date, status, case_count) "
+        "SELECT court_id, case_date, status, COUNT(id) FROM tblcase "
+        "GROUP BY court_id, case_date, status"
+    )
+    op.execute(
+        "INSERT INTO tblcourt_daily_rollup "
+        "(court_id, day, new_cases, finished_cases, postponed_cases, status_changes) "
+        "SELECT court_id, day, SUM(new_cases), SUM(finished_cases), SUM(postponed_cases), SUM(status_changes) "
+        "FROM ("
+        "SELECT court_id, date(added_date) AS day, 1 AS new_cases, 0 AS finished_cases, "
+        "0 AS postponed_cases, 0 AS status_changes "
+        "FROM tblcase WHERE added_date IS NOT NULL "
+        "UNION ALL "
+        "SELECT court_id, date(created_at), 0, "
+        "CASE WHEN details LIKE '% to finished' THEN 1 ELSE 0 END, "
+        "CASE WHEN details LIKE '% to postponed' THEN 1 ELSE 0 END, 1 "
+        "FROM tblactivity_log WHERE action = 'Status Changed' AND created_at IS NOT NULL"
+        ") AS events GROUP BY court_id, day"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('tblcourt_daily_rollup', schema=None) as batch_op:
+        batch_op.drop_index('ix_daily_rollup_day_court')
+
+    op.drop_table('tblcourt_daily_rollup')
+    with op.batch_alter_table('tblcase_status_rollup', schema=None) as batch_op:
+        batch_op.drop_index('ix_status_rollup_court_date')
+
+    op.drop_table('tblcase_status_rollup')
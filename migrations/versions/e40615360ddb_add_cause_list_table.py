@@ -0,0 +1,36 @@
+"""add precomputed daily cause list table
+
+Revision ID: e40615360ddb
+Revises: cfa1d4b605d2
+Create Date: 2026-10-18 10:02:51.470915
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e40615360ddb'
+down_revision = 'cfa1d4b605d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('tblcause_list',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('court_id', sa.Integer(), nullable=False),
+    sa.Column('list_date', sa.Date(), nullable=False),
+    sa.Column('case_count', sa.Integer(), nullable=False),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('html', sa.Text(), nullable=False),
+    sa.Column('print_html', sa.Text(), nullable=False),
+    sa.Column('generated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['court_id'], ['tblcourt.id'], name='fk_cause_list_court', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('court_id', 'list_date', name='uq_cause_list_court_date')
+    )
+
+
+def downgrade():
+    op.drop_table('tblcause_list')
@@ -0,0 +1,72 @@
+"""add parsed case number columns
+
+Revision ID: f1a7d92c4e30
+Revises: c3e8a1f0b6d4
+Create Date: 2026-10-18 16:20:44.913507
+
+"""
+import re
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1a7d92c4e30'
+down_revision = 'c3e8a1f0b6d4'
+branch_labels = None
+depends_on = None
+
+
+def _parse_case_number(value):
+    # Same rules as app.models.models.parse_case_number, frozen for this migration
+    parts = [part for part in re.split(r'\s*[/\\-]\s*', str(value or '').strip()) if part]
+    year = serial = None
+    if len(parts) > 1 and parts[-1].isdigit() and len(parts[-1]) == 4:
+        year = int(parts.pop())
+    for position, part in enumerate(parts):
+        if part.isdigit():
+            serial = int(parts.pop(position))
+            break
+    return '/'.join(parts) or None, serial, year
+
+
+def upgrade():
+    with op.batch_alter_table('tblcase', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('case_prefix', sa.String(length=50), nullable=True))
+        batch_op.add_column(sa.Column('case_serial', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('case_year', sa.Integer(), nullable=True))
+        batch_op.create_index('ix_case_court_number_parts', ['court_id', 'case_year', 'case_serial'], unique=False)
+
+    bind = op.get_bind()
+    tblcase = sa.table(
+        'tblcase',
+        sa.column('id', sa.Integer),
+        sa.column('case_number', sa.String),
+        sa.column('case_prefix', sa.String),
+        sa.column('case_serial', sa.Integer),
+        sa.column('case_year', sa.Integer),
+    )
+    rows = bind.execute(sa.select(tblcase.c.id, tblcase.c.case_number)).fetchall()
+    updates = []
+    for row in rows:
+        prefix, serial, year = _parse_case_number(row.case_number)
+        updates.append({'case_id': row.id, 'prefix': prefix, 'serial': serial, 'year': year})
+    if updates:
+        bind.execute(
+            tblcase.update()
+            .where(tblcase.c.id == sa.bindparam('case_id'))
+            .values(
+                case_prefix=sa.bindparam('prefix'),
+                case_serial=sa.bindparam('serial'),
+                case_year=sa.bindparam('year')
+            ),
+            updates
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('tblcase', schema=None) as batch_op:
+        batch_op.drop_index('ix_case_court_number_parts')
+        batch_op.drop_column('case_year')
+        batch_op.drop_column('case_serial')
+        batch_op.drop_column('case_prefix')
@@ -0,0 +1,140 @@
+from datetime import date
+from app.models.models import Case, CaseStatus
+from extensions import db
+
+
+def login(client):
+    return client.post('/login', data=dict(
+        username='admin',
+        password='password'
+    ), follow_redirects=True)
+
+
+def test_api_requires_login(client, init_database):
+    """
+    GIVEN an anonymous client
+    WHEN the cases API is requested
+    THEN check that it answers 401 JSON instead of redirecting to the login page
+    """
+    response = client.get('/api/v1/courts/1/cases')
+    assert response.status_code == 401
+    assert response.get_json()['success'] is False
+
+
+def test_api_court_cases_pages(client, init_database):
+    """
+    GIVEN cases of a court
+    WHEN they are listed through the API page by page with sparse fields and filters
+    THEN check the order, the cursors, the selected fields and the filters
+    """
+    from app.utils.sequences import close_case_order_gaps
+
+    login(client)
+    db.session.add_all([
+        Case(case_number=f'{n}/2026', c_order=n, court_id=1, case_date=date(2026, 1, n),
+             next_session_date=f'2026-05-0{n}', status=CaseStatus.postponed if n % 2 else CaseStatus.active)
+        for n in range(1, 6)
+    ])
+    db.session.commit()
+
+    numbers = []
+    url = '/api/v1/courts/1/cases?limit=2&fields=case_number,status'
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        data = response.get_json()
+        assert all(set(case) == {'id', 'c_order', 'case_number', 'status'} for case in data['cases'])
+        numbers += [case['case_number'] for case in data['cases']]
+        url = f"/api/v1/courts/1/cases?limit=2&fields=case_number,status&cursor={data['next_cursor']}" if data['next_cursor'] else None
+    assert numbers == ['1/2026', '2/2026', '3/2026', '4/2026', '5/2026']
+
+    # Deleting a case on an earlier page renumbers c_order but does not move the cursor
+    data = client.get('/api/v1/courts/1/cases?limit=3&fields=case_number').get_json()
+    extra = Case(case_number='6/2026', c_order=6, court_id=1)
+    db.session.add(extra)
+    db.session.commit()
+    removed = Case.query.filter_by(court_id=1, case_number='2/2026').one()
+    db.session.delete(removed)
+    close_case_order_gaps({1: [removed.c_order]})
+    db.session.commit()
+    data = client.get(f"/api/v1/courts/1/cases?limit=10&fields=case_number&cursor={data['next_cursor']}").get_json()
+    assert [case['case_number'] for case in data['cases']] == ['4/2026', '5/2026', '6/2026']
+
+    data = client.get('/api/v1/courts/1/cases?status=postponed&session_from=2026-05-02').get_json()
+    assert [case['case_number'] for case in data['cases']] == ['3/2026', '5/2026']
+    assert data['cases'][0]['session_date'] == '2026-05-03'
+
+    assert client.get('/api/v1/courts/1/cases?fields=password').status_code == 400
+    assert client.get('/api/v1/courts/1/cases?cursor=@@').status_code == 400
+    assert client.get('/api/v1/courts/1/cases?date_to=31-01-2026').status_code == 400
+    assert client.get('/api/v1/courts/99/cases').status_code == 404
+
+
+def test_api_conditional_get(client, init_database):
+    """
+    GIVEN a previous response of the cases API
+    WHEN it is requested again with If-Modified-Since
+    THEN check that it is 304 until a case of the court changes
+    """
+    from app.utils.sequences import allocate_case_orders
+
+    login(client)
+    case = Case(case_number='1/9034', c_order=allocate_case_orders(1), court_id=1)
+    db.session.add(case)
+    db.session.commit()
+
+    response = client.get('/api/v1/courts/1/cases')
+    last_modified = response.headers['Last-Modified']
+
+    response = client.get('/api/v1/courts/1/cases', headers={'If-Modified-Since': last_modified})
+    assert response.status_code == 304
+
+    case.status = CaseStatus.finished
+    case.updated_at = case.updated_at.replace(year=2099)
+    db.session.commit()
+
+    response = client.get('/api/v1/courts/1/cases', headers={'If-Modified-Since': last_modified})
+    assert response.status_code == 200
+
+
+def test_api_bulk_create_cases(client, init_database):
+    """
+    GIVEN a batch of new cases for a court
+    WHEN it is posted to the bulk-create API
+    THEN check that the cases get consecutive orders and log rows, and invalid or duplicate batches write nothing
+    """
+    from app.models.models import ActivityLog
+
+    login(client)
+    highest = db.session.query(db.func.max(Case.c_order)).filter(Case.court_id == 1).scalar()
+    response = client.post('/api/v1/courts/1/cases', json={'cases': [
+        {'case_number': '1/2040', 'next_session_date': '2040-02-01', 'status': 'active'},
+        {'case_number': '2/2040', 'case_date': '2040-01-15', 'num_sessions': 3},
+    ]})
+    data = response.get_json()
+    assert response.status_code == 201 and data['created'] == 2
+    assert [case['c_order'] for case in data['cases']] == [(highest or 0) + 1, (highest or 0) + 2]
+
+    first = Case.query.filter_by(court_id=1, case_number='1/2040').one()
+    assert first.session_date == date(2040, 2, 1) and first.status == CaseStatus.active
+    assert ActivityLog.query.filter(
+        ActivityLog.action == 'Case Added',
+        ActivityLog.case_id.in_([case['id'] for case in data['cases']])
+    ).count() == 2
+
+    response = client.post('/api/v1/courts/1/cases', json={'cases': [
+        {'case_number': '3/2040'}, {'case_number': '3/2040'}, {'case_date': 'x'}
+    ]})
+    assert response.status_code == 400
+    assert [error['index'] for error in response.get_json()['errors']] == [1, 2]
+
+    response = client.post('/api/v1/courts/1/cases', json={'cases': [{'case_number': '4/2040'}, {'case_number': '2/2040'}]})
+    assert response.status_code == 409 and response.get_json()['duplicates'] == ['2/2040']
+    assert Case.query.filter_by(court_id=1, case_number='4/2040').count() == 0
+
+    for body in ([{'case_number': '5/2040'}], 'cases', 7):
+        response = client.post('/api/v1/courts/1/cases', json=body)
+        assert response.status_code == 400 and response.get_json()['success'] is False
+    response = client.post('/api/v1/courts/1/cases', json={'cases': [{'case_number': '5/2040', 'status': ['active']}]})
+    assert response.status_code == 400
+    assert Case.query.filter_by(court_id=1, case_number='5/2040').count() == 0
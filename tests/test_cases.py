@@ -0,0 +1,850 @@
+from datetime import date
+from app.models.models import Case, CaseStatus
+from extensions import db
+
+
+def login(client):
+    return client.post('/login', data=dict(
+        username='admin',
+        password='password'
+    ), follow_redirects=True)
+
+
+def test_session_date_normalized(init_database):
+    """
+    GIVEN a Case with a free-text next session date
+    WHEN the next session date is set or changed
+    THEN check that the normalized session date follows it
+    """
+    case = Case(case_number='1/2026', c_order=1, court_id=1, next_session_date='2026-03-05T08:15:00')
+    assert case.session_date == date(2026, 3, 5)
+    case.next_session_date = '07/03/2026'
+    assert case.session_date == date(2026, 3, 7)
+    case.next_session_date = 'not a date'
+    assert case.session_date is None
+
+
+def test_session_calendar_counts(client, init_database):
+    """
+    GIVEN cases with sessions in a month
+    WHEN the session calendar is requested for that month
+    THEN check the per-day counts, and that a new case invalidates the cache
+    """
+    login(client)
+    db.session.add_all([
+        Case(case_number='10/2026', c_order=10, court_id=1, next_session_date='2026-03-05', status=CaseStatus.active),
+        Case(case_number='11/2026', c_order=11, court_id=1, next_session_date='2026-03-05T09:00:00'),
+        Case(case_number='12/2026', c_order=12, court_id=1, next_session_date='2026-03-20'),
+        Case(case_number='13/2026', c_order=13, court_id=1, next_session_date='2026-04-01'),
+    ])
+    db.session.commit()
+
+    response = client.get('/session_calendar?month=2026-03')
+    data = response.get_json()
+    assert response.status_code == 200
+    assert data['total'] == 3
+    assert len(data['days']) == 31
+    counts = {day['date']: day['count'] for day in data['days']}
+    assert counts['2026-03-05'] == 2
+    assert counts['2026-03-20'] == 1
+
+    client.post('/add_case', data=dict(case_number='14/2026', next_session_date='2026-03-20'))
+    counts = {day['date']: day['count'] for day in client.get('/session_calendar?month=2026-03').get_json()['days']}
+    assert counts['2026-03-20'] == 2
+
+    assert client.get('/session_calendar?month=2026-13').status_code == 400
+
+
+def test_daily_cause_lists(app, client, init_database):
+    """
+    GIVEN cases with a session on a given day
+    WHEN the daily cause lists are generated
+    THEN check that the stored snapshot lists them in c_order and is served as-is,
+         and that the warmed caches outlive the day until the next run
+    """
+    import time
+    from app.models.models import CauseList
+    from app.utils.cache import cache
+    from app.utils.cause_lists import generate_daily_cause_lists
+    from app.utils.sequences import allocate_case_orders
+
+    login(client)
+    first = allocate_case_orders(1, count=3)
+    db.session.add_all([
+        Case(case_number='2/9027', c_order=first + 1, court_id=1, next_session_date='2026-05-14T09:00:00'),
+        Case(case_number='1/9027', c_order=first, court_id=1, next_session_date='2026-05-14', status=CaseStatus.active),
+        Case(case_number='3/9027', c_order=first + 2, court_id=1, next_session_date='2026-05-15'),
+    ])
+    db.session.commit()
+
+    results = generate_daily_cause_lists(app, date(2026, 5, 14), max_workers=1, warm=True)
+    assert (1, 2, None) in results
+    for key in (('board', 1), ('dashboard', 1), ('session_calendar', 1, 2026, 5)):
+        assert cache._entries[key][0] - time.monotonic() > 24 * 60 * 60
+
+    snapshot = CauseList.query.filter_by(court_id=1, list_date=date(2026, 5, 14)).one()
+    assert '1/9027' in snapshot.html and 'window.print()' in snapshot.print_html
+
+    data = client.get('/cause_list?date=2026-05-14&format=json').get_json()
+    assert [case['case_number'] for case in data['cases']] == ['1/9027', '2/9027']
+    assert data['cases'][0]['status'] == 'active'
+
+
+def test_case_order_allocation(init_database):
+    """
+    GIVEN a court with existing cases
+    WHEN orders are allocated and a JSON import has rows without c_order
+    THEN check that orders continue after the highest one, in one block per import
+    """
+    from app.models.models import Court
+    from app.utils.json_importer import JsonToDatabase
+    from app.utils.sequences import allocate_case_orders
+
+    court = Court(name='Allocation Court')
+    db.session.add(court)
+    db.session.commit()
+    db.session.add_all([Case(case_number=f'{n}/9028', c_order=n, court_id=court.id) for n in (1, 2, 5)])
+    db.session.commit()
+
+    assert allocate_case_orders(court.id) == 6
+    assert allocate_case_orders(court.id, count=5) == 7
+    db.session.commit()
+
+    importer = JsonToDatabase(db.session, court.id, '.')
+    result = importer.import_data([
+        {'case_number': '20/2026'},
+        {'case_number': '21/2026', 'c_order': 'x'},
+    ], current_user_id=None)
+    assert result['success'] and result['cases_added'] == 2
+
+    orders = [Case.query.filter_by(court_id=court.id, case_number=number).one().c_order for number in ('20/2026', '21/2026')]
+    assert orders == [12, 13]
+
+
+def test_close_case_order_gaps(init_database):
+    """
+    GIVEN a court whose cases are numbered 1..n
+    WHEN several cases are deleted and the gaps are closed
+    THEN check that the remaining cases are renumbered 1..m in the same order
+    """
+    from app.models.models import Court
+    from app.utils.sequences import allocate_case_orders, close_case_order_gaps
+
+    court = Court(name='Renumber Court')
+    db.session.add(court)
+    db.session.commit()
+    db.session.add_all([Case(case_number=f'{n}/2025', c_order=n, court_id=court.id) for n in range(1, 11)])
+    db.session.commit()
+
+    deleted = Case.query.filter(Case.court_id == court.id, Case.c_order.in_([2, 5, 6])).all()
+    for case in deleted:
+        db.session.delete(case)
+    close_case_order_gaps({court.id: [case.c_order for case in deleted]})
+    db.session.commit()
+
+    remaining = Case.query.filter_by(court_id=court.id).order_by(Case.c_order).all()
+    assert [case.c_order for case in remaining] == list(range(1, 8))
+    assert [case.case_number for case in remaining] == ['1/2025', '3/2025', '4/2025', '7/2025', '8/2025', '9/2025', '10/2025']
+    assert allocate_case_orders(court.id) == 8
+    db.session.add(Case(case_number='11/2025', c_order=8, court_id=court.id))
+    db.session.commit()
+
+    # With the counter seeded, it is lowered along with the shifted cases
+    db.session.delete(remaining[0])
+    close_case_order_gaps({court.id: [1]})
+    db.session.commit()
+    assert [case.c_order for case in Case.query.filter_by(court_id=court.id).order_by(Case.c_order)] == list(range(1, 8))
+    assert allocate_case_orders(court.id) == 8
+
+
+def test_delete_all_matching_filter(client, init_database):
+    """
+    GIVEN cases matching a case-number filter, one of them on the display board
+    WHEN "all matching" cases are deleted through the filtered bulk delete form
+    THEN check they are gone with their display entries, their logs are kept detached,
+         and a log row is written per case
+    """
+    from app.models.models import ActivityLog, DisplayCase
+
+    login(client)
+    cases = [Case(case_number=f'{n}/2030', c_order=100 + n, court_id=1) for n in range(1, 4)]
+    keep = Case(case_number='1/2031', c_order=104, court_id=1)
+    db.session.add_all(cases + [keep])
+    db.session.commit()
+    db.session.add(DisplayCase(case_id=cases[0].id, court_id=1, display_order=1))
+    added_log = ActivityLog(action='Case Added', case_id=cases[0].id, court_id=1)
+    db.session.add(added_log)
+    db.session.commit()
+    deleted_ids = [case.id for case in cases]
+
+    response = client.post('/delete_selected_cases?case_number=/2030', data=dict(select_all_matching='1'))
+    assert response.status_code == 302
+
+    db.session.expire_all()
+    assert Case.query.filter(Case.id.in_(deleted_ids)).count() == 0
+    assert DisplayCase.query.filter(DisplayCase.case_id.in_(deleted_ids)).count() == 0
+    assert ActivityLog.query.filter(ActivityLog.case_id.in_(deleted_ids)).count() == 0
+    assert db.session.get(ActivityLog, added_log.id).case_id is None
+    assert ActivityLog.query.filter(ActivityLog.details.like('Deleted case %/2030')).count() == 3
+    assert db.session.get(Case, keep.id).c_order == 101
+
+
+def test_bulk_change_status(client, init_database):
+    """
+    GIVEN several cases of the court
+    WHEN their statuses are changed through the bulk endpoint
+    THEN check the statuses, one log row per real transition, and input validation
+    """
+    from app.models.models import ActivityLog
+
+    login(client)
+    cases = [Case(case_number=f'{n}/2032', c_order=200 + n, court_id=1, status=CaseStatus.inactive) for n in range(1, 4)]
+    db.session.add_all(cases)
+    db.session.commit()
+
+    response = client.post('/bulk_change_status', json={'changes': [
+        {'case_id': cases[0].id, 'status': 'finished'},
+        {'case_id': cases[1].id, 'status': 'in_session'},
+        {'case_id': cases[2].id, 'status': 'inactive'},
+    ]})
+    data = response.get_json()
+    assert response.status_code == 200 and data['success']
+    assert sorted(item['status'] for item in data['updated']) == ['finished', 'in session']
+
+    db.session.expire_all()
+    assert [case.status for case in cases] == [CaseStatus.finished, CaseStatus.in_session, CaseStatus.inactive]
+    assert ActivityLog.query.filter(
+        ActivityLog.action == 'Status Changed',
+        ActivityLog.case_id.in_([case.id for case in cases])
+    ).count() == 2
+
+    response = client.post('/bulk_change_status', json={'changes': [{'case_id': cases[0].id, 'status': 'bogus'}]})
+    assert response.status_code == 400
+
+
+def test_export_cases_streams(client, init_database):
+    """
+    GIVEN cases of the court
+    WHEN they are exported as CSV and NDJSON with filters
+    THEN check the header, the filtered rows and that bad input is rejected
+    """
+    import csv
+    import io
+    import json
+    from app.utils.exports import EXPORT_FIELDS
+
+    login(client)
+    db.session.add_all([
+        Case(case_number=f'{n}/2033', c_order=300 + n, court_id=1, status=CaseStatus.postponed) for n in range(1, 4)
+    ])
+    db.session.commit()
+
+    response = client.get('/cases/export/csv?case_number=/2033')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/csv'
+    assert 'attachment' in response.headers['Content-Disposition']
+    rows = list(csv.reader(io.StringIO(response.get_data(as_text=True).lstrip('\ufeff'))))
+    assert tuple(rows[0]) == EXPORT_FIELDS
+    assert [row[1] for row in rows[1:]] == ['1/2033', '2/2033', '3/2033']
+
+    response = client.get('/cases/export/ndjson?case_number=/2033&status=postponed&court_id=1')
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert len(lines) == 3
+    assert lines[0]['status'] == 'postponed' and lines[0]['court_name']
+
+    assert client.get('/cases/export/ndjson?case_number=/2033&status=finished').get_data(as_text=True) == ''
+    assert client.get('/cases/export/xml').status_code == 400
+    assert client.get('/cases/export/csv?status=bogus').status_code == 400
+
+
+def test_excel_report_export(client, init_database):
+    """
+    GIVEN cases of the court
+    WHEN the Excel report is exported with the statistics filters
+    THEN check that both sheets are written and the case rows are filtered
+    """
+    import io
+    from openpyxl import load_workbook
+
+    login(client)
+    db.session.add_all([
+        Case(case_number='1/2034', c_order=401, court_id=1, case_date=date(2034, 1, 10)),
+        Case(case_number='2/2034', c_order=402, court_id=1, case_date=date(2034, 2, 10)),
+    ])
+    db.session.commit()
+
+    response = client.get('/export_report/excel?start_date=2034-01-01&end_date=2034-01-31&court_id=1')
+    assert response.status_code == 200
+    workbook = load_workbook(io.BytesIO(response.data), read_only=True)
+    assert workbook.sheetnames == ['القضايا', 'سجل الأنشطة']
+    rows = list(workbook['القضايا'].values)
+    assert rows[0][0] == 'رقم القضية'
+    assert [row[0] for row in rows[1:]] == ['1/2034']
+
+    # Within REPORT_CACHE_TTL the same file is reused, but not once the court changed
+    from app.utils.cache import invalidate_court
+    db.session.add(Case(case_number='3/2034', c_order=403, court_id=1, case_date=date(2034, 1, 20)))
+    db.session.commit()
+    invalidate_court(1)
+    response = client.get('/export_report/excel?start_date=2034-01-01&end_date=2034-01-31&court_id=1')
+    rows = list(load_workbook(io.BytesIO(response.data), read_only=True)['القضايا'].values)
+    assert sorted(row[0] for row in rows[1:]) == ['1/2034', '3/2034']
+
+    assert client.get('/export_report/excel?start_date=bad').status_code == 302
+
+
+def test_case_list_rows(client, init_database):
+    """
+    GIVEN cases on the display board
+    WHEN the listing pages are built from read-model rows
+    THEN check that the rows carry the joined names and the pages render them
+    """
+    from app.models.models import DisplayCase
+    from app.utils.read_models import case_list_rows, display_entry_rows
+
+    login(client)
+    case = Case(case_number='1/2036', c_order=501, court_id=1, user_id=1, status=CaseStatus.in_session, case_subject='Read model')
+    db.session.add(case)
+    db.session.commit()
+    db.session.add(DisplayCase(case_id=case.id, court_id=1, display_order=1))
+    db.session.commit()
+
+    row = case_list_rows(Case.query.filter(Case.id == case.id))[0]
+    assert (row.case_number, row.court_name, row.user_name) == ('1/2036', 'Test Court', 'Admin User')
+    assert not isinstance(row, Case)
+
+    entry = [entry for entry in display_entry_rows(1) if entry.case_id == case.id][0]
+    assert entry.status == CaseStatus.in_session
+
+    assert '1/2036' in client.get('/court_cases/1').get_data(as_text=True)
+    assert 'Read model' in client.get('/manage_display').get_data(as_text=True)
+
+
+def test_cases_compact_view(client, init_database):
+    """
+    GIVEN filtered cases
+    WHEN the compact cases view and its JSON rows are requested
+    THEN check that the page carries no case rows and the JSON holds them as compact arrays
+    """
+    login(client)
+    db.session.add_all([Case(case_number=f'{n}/2037', c_order=600 + n, court_id=1, status=CaseStatus.in_session) for n in range(1, 3)])
+    db.session.commit()
+
+    page = client.get('/cases?case_number=/2037&view=compact').get_data(as_text=True)
+    assert 'virtual-body' in page and '1/2037' not in page
+
+    data = client.get('/cases/data?case_number=/2037').get_json()
+    assert data['count'] == 2 and data['columns'][0] == 'id'
+    assert sorted(row[1] for row in data['rows']) == ['1/2037', '2/2037']
+    assert data['rows'][0][-1] == 'in session'
+
+    assert client.get('/cases/data?date=bad').status_code == 400
+
+
+def test_case_number_autocomplete(client, init_database):
+    """
+    GIVEN the in-memory case-number index of a court
+    WHEN cases are added, renamed and deleted, or another worker invalidates the court
+    THEN check that suggestions follow without rebuilding, a remote change drops the index,
+         and duplicate numbers are rejected from the database rather than the index
+    """
+    from app.models.models import CourtCacheVersion
+    from app.utils import case_index
+    from app.utils.cache import sync_court_caches
+
+    login(client)
+    client.post('/add_case', data=dict(case_number='77/2038'))
+    data = client.get('/cases/autocomplete?q=77/').get_json()
+    assert [item['case_number'] for item in data['suggestions']] == ['77/2038']
+
+    index = case_index.get_case_index(1)
+    client.post('/add_case', data=dict(case_number='77/2039'))
+    case = Case.query.filter_by(court_id=1, case_number='77/2038').one()
+    client.post(f'/edit_case/{case.id}', data=dict(case_number='78/2038', status='inactive'))
+    assert case_index.get_case_index(1) is index
+    assert [number for _, number in case_index.suggest_case_numbers(1, '7')][:2] == ['77/2039', '78/2038']
+
+    client.post(f'/delete_case/{case.id}')
+    assert case_index.suggest_case_numbers(1, '78/') == []
+
+    # Another worker bumps the court's version; the next sync drops the local index
+    sync_court_caches(force=True)
+    version = db.session.get(CourtCacheVersion, 1)
+    version.version += 1
+    db.session.commit()
+    sync_court_caches(force=True)
+    assert case_index.get_case_index(1) is not index
+
+    response = client.post('/add_case', data=dict(case_number='77/2039'))
+    assert 'already exists' in response.get_data(as_text=True)
+
+    # A case this worker's index has not seen is still caught by the database check
+    case_index.get_case_index(1)
+    db.session.add(Case(case_number='79/2038', c_order=7938, court_id=1))
+    db.session.commit()
+    response = client.post('/add_case', data=dict(case_number='79/2038'))
+    assert 'already exists' in response.get_data(as_text=True)
+
+
+def test_case_number_natural_order(client, init_database):
+    """
+    GIVEN cases whose numbers sort differently as text and as numbers
+    WHEN the cases are listed in number order and filtered by case year
+    THEN check the natural order and the year filter
+    """
+    login(client)
+    response = client.post('/api/v1/courts/1/cases', json={'cases': [
+        {'case_number': '10/9039'}, {'case_number': '9/9039'}, {'case_number': '100/9039'}, {'case_number': '5/9040'}
+    ]})
+    assert response.status_code == 201
+    assert Case.query.filter_by(court_id=1, case_number='100/9039').one().case_serial == 100
+
+    data = client.get('/cases/data?case_year=9039&order=number').get_json()
+    assert [row[1] for row in data['rows']] == ['9/9039', '10/9039', '100/9039']
+
+    data = client.get('/api/v1/courts/1/cases?case_year=9039&serial_from=10&fields=case_number').get_json()
+    assert sorted(case['case_number'] for case in data['cases']) == ['10/9039', '100/9039']
+
+
+def test_statistics_aggregates(client, init_database):
+    """
+    GIVEN a court with cases in several statuses
+    WHEN the statistics page is requested for that court
+    THEN check the summary and per-court figures counted by the database
+    """
+    from datetime import datetime, timedelta
+    from app.models.models import Court
+    from app.utils.statistics import rollup_filters, court_status_counts, finished_case_durations, status_summary
+
+    login(client)
+    court = Court(name='Statistics Court')
+    db.session.add(court)
+    db.session.commit()
+    today = datetime.utcnow().date()
+    finished = [
+        Case(case_number='3/9050', c_order=3, court_id=court.id, case_date=today - timedelta(days=10)),
+        Case(case_number='4/9050', c_order=4, court_id=court.id, case_date=today - timedelta(days=20)),
+    ]
+    db.session.add_all(finished + [
+        Case(case_number='1/9050', c_order=1, court_id=court.id, status=CaseStatus.in_session),
+        Case(case_number='2/9050', c_order=2, court_id=court.id, status=CaseStatus.postponed),
+        # Imported as finished: no finishing time, so no duration
+        Case(case_number='5/9050', c_order=5, court_id=court.id, status=CaseStatus.finished,
+             case_date=today - timedelta(days=90)),
+    ])
+    db.session.commit()
+    for case in finished:
+        case.status = CaseStatus.finished
+    db.session.commit()
+
+    conditions = rollup_filters(court_id=court.id)
+    counts = court_status_counts(conditions)
+    summary = status_summary(counts)
+    assert summary['total_cases'] == 5
+    assert summary['active_cases'] == 1
+    assert summary['finished_cases'] == 3
+    assert summary['postponed_cases'] == 1
+    assert finished_case_durations(court_id=court.id) == {court.id: 15}
+
+    response = client.get(f'/statistics?court_id={court.id}')
+    assert response.status_code == 200
+    assert 'Statistics Court' in response.get_data(as_text=True)
+
+
+def test_statistics_monthly_trends(init_database):
+    """
+    GIVEN cases added and finished in different calendar months
+    WHEN the monthly trend series are computed
+    THEN check that every calendar month appears once with its counts
+    """
+    from datetime import datetime
+    from app.models.models import CaseStatusChange
+    from app.utils.rollups import rebuild_rollups
+    from app.utils.statistics import monthly_trends, recent_months
+
+    assert recent_months(3, date(2026, 1, 31)) == [(2025, 11), (2025, 12), (2026, 1)]
+    assert len(set(recent_months(12, date(2026, 3, 31)))) == 12
+
+    db.session.add_all([
+        Case(case_number='1/9051', c_order=1, court_id=1, added_date=datetime(2024, 1, 31, 23, 30)),
+        Case(case_number='2/9051', c_order=2, court_id=1, added_date=datetime(2024, 3, 1)),
+        CaseStatusChange(court_id=1, from_status=CaseStatus.active, to_status=CaseStatus.finished,
+                         changed_at=datetime(2024, 2, 10)),
+        CaseStatusChange(court_id=1, from_status=CaseStatus.finished, to_status=CaseStatus.active,
+                         changed_at=datetime(2024, 2, 11)),
+    ])
+    db.session.commit()
+    rebuild_rollups()
+    db.session.commit()
+
+    labels, new_cases, finished_cases = monthly_trends(3, date(2024, 3, 15))
+    assert labels == ['2024-01', '2024-02', '2024-03']
+    assert new_cases == [1, 0, 1]
+    assert finished_cases == [0, 1, 0]
+
+
+def test_statistics_per_user(init_database):
+    """
+    GIVEN users who added cases and logged activities
+    WHEN the per-user statistics are computed with a date range
+    THEN check the cases-added counts and the latest activity of each user
+    """
+    from datetime import datetime
+    from app.models.models import ActivityLog, User
+    from app.utils.statistics import user_statistics
+
+    clerk = User(username='stats_clerk', password='x', name='Clerk', email='clerk@example.com', tel='1')
+    db.session.add(clerk)
+    db.session.commit()
+    db.session.add_all([
+        Case(case_number='1/9052', c_order=1, court_id=1, user_id=clerk.id, added_date=datetime(2024, 5, 2)),
+        Case(case_number='2/9052', c_order=2, court_id=1, user_id=clerk.id, added_date=datetime(2024, 6, 2)),
+        ActivityLog(user_id=clerk.id, action='Case Added', created_at=datetime(2024, 5, 2)),
+        ActivityLog(user_id=clerk.id, action='Case Added', created_at=datetime(2024, 6, 2)),
+    ])
+    db.session.commit()
+
+    stats = {row['username']: row for row in user_statistics()}
+    assert stats['stats_clerk']['cases_added'] == 2
+    assert stats['stats_clerk']['last_activity'] == datetime(2024, 6, 2)
+
+    stats = {row['username']: row for row in user_statistics(date(2024, 5, 1), date(2024, 5, 31))}
+    assert stats['stats_clerk']['cases_added'] == 1
+
+
+def test_statistics_rollups_follow_writes(client, init_database):
+    """
+    GIVEN cases added, edited, re-statused and deleted through the app
+    WHEN the status rollup is summed
+    THEN check that it matches the counts over tblcase, and that today's transitions are recorded
+    """
+    from datetime import datetime
+    from sqlalchemy import func
+    from app.models.models import CaseStatusChange, CourtDailyRollup
+    from app.utils.rollups import rebuild_rollups
+    from app.utils.statistics import court_status_counts, rollup_filters
+
+    def raw_counts():
+        counts = {}
+        for court_id, status, count in db.session.query(Case.court_id, Case.status, func.count(Case.id)).group_by(
+                Case.court_id, Case.status):
+            counts.setdefault(court_id, {})[status] = count
+        return counts
+
+    def finished_today():
+        return db.session.query(func.sum(CourtDailyRollup.finished_cases)).filter(
+            CourtDailyRollup.day == datetime.utcnow().date()).scalar() or 0
+
+    login(client)
+    before = finished_today()
+    client.post('/add_case', data=dict(case_number='1/9053', case_date='2024-02-01'))
+    client.post('/add_case', data=dict(case_number='2/9053'))
+    first = Case.query.filter_by(court_id=1, case_number='1/9053').one()
+    second = Case.query.filter_by(court_id=1, case_number='2/9053').one()
+    client.get(f'/change_status/{first.id}/finished')
+    client.post(f'/edit_case/{second.id}', data=dict(case_number='2/9053', case_date='2024-03-01', status='postponed'))
+    client.post('/bulk_change_status', json={'changes': [{'case_id': second.id, 'status': 'finished'}]})
+    client.post(f'/delete_case/{first.id}')
+    client.post('/api/v1/courts/1/cases', json={'cases': [{'case_number': '3/9053', 'status': 'postponed'}]})
+
+    assert dict(court_status_counts(rollup_filters())) == raw_counts()
+    assert finished_today() == before + 2
+
+    history = CaseStatusChange.query.filter_by(court_id=1).filter(
+        CaseStatusChange.changed_at >= datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    ).order_by(CaseStatusChange.id).all()
+    assert [(change.case_id, change.from_status, change.to_status) for change in history[-3:]] == [
+        (None, CaseStatus.inactive, CaseStatus.finished),
+        (second.id, CaseStatus.inactive, CaseStatus.postponed),
+        (second.id, CaseStatus.postponed, CaseStatus.finished),
+    ]
+    assert all(change.user_id is not None for change in history[-3:])
+
+    rebuild_rollups()
+    db.session.commit()
+    assert dict(court_status_counts(rollup_filters())) == raw_counts()
+
+
+def test_duration_percentiles(client, init_database):
+    """
+    GIVEN finished cases of a court with known times to finish
+    WHEN the duration analytics are requested per court and per subject
+    THEN check the nearest-rank median and 90th percentile computed in SQL
+    """
+    from datetime import datetime, timedelta
+    from app.models.models import CaseStatusChange, Court
+    from app.utils.analytics import duration_percentiles
+
+    login(client)
+    court = Court(name='Durations Court')
+    db.session.add(court)
+    db.session.commit()
+    finished_at = datetime(2024, 6, 1, 10, 30)
+    for position, days in enumerate((40, 10, 50, 30, 20), start=1):
+        case = Case(case_number=f'{position}/9054', c_order=position, court_id=court.id,
+                    case_date=finished_at.date() - timedelta(days=days), status=CaseStatus.finished,
+                    num_sessions=2, case_subject='rent' if days <= 30 else 'debt')
+        db.session.add(case)
+        db.session.flush()
+        db.session.add(CaseStatusChange(case_id=case.id, court_id=court.id, from_status=CaseStatus.active,
+                                        to_status=CaseStatus.finished, changed_at=finished_at))
+    db.session.commit()
+
+    [row] = duration_percentiles('court', court_id=court.id)
+    assert (row['cases'], row['p50_days'], row['p90_days'], row['max_days']) == (5, 30, 50, 50)
+    assert row['avg_days'] == 30 and row['avg_sessions'] == 2
+
+    data = client.get(f'/statistics/durations?group=subject&court_id={court.id}').get_json()
+    by_subject = {row['case_subject']: row for row in data['rows']}
+    assert (by_subject['rent']['cases'], by_subject['rent']['p50_days']) == (3, 20)
+    assert (by_subject['debt']['cases'], by_subject['debt']['p90_days']) == (2, 50)
+
+    assert client.get('/statistics/durations?group=judge').status_code == 400
+
+
+def test_statistics_panels(client, init_database):
+    """
+    GIVEN the statistics page shell and its panel endpoints
+    WHEN the panels are requested
+    THEN check the JSON data, the timing headers and that repeated requests hit the cache
+    """
+    from app.models.models import Court
+
+    login(client)
+    response = client.get('/statistics')
+    assert response.status_code == 200
+    assert '/statistics/panels/PANEL' in response.get_data(as_text=True)
+
+    court = Court(name='Panels Court')
+    db.session.add(court)
+    db.session.commit()
+    db.session.add_all([
+        Case(case_number='1/9055', c_order=1, court_id=court.id, status=CaseStatus.in_session),
+        Case(case_number='2/9055', c_order=2, court_id=court.id, status=CaseStatus.finished),
+    ])
+    db.session.commit()
+
+    response = client.get(f'/statistics/panels/summary?court_id={court.id}')
+    data = response.get_json()['data']
+    assert (data['total_cases'], data['active_cases'], data['finished_cases']) == (2, 1, 1)
+    assert data['status_distribution'] == [1, 0, 0, 1]
+    assert response.headers['X-Cache'] == 'MISS'
+    assert response.headers['Server-Timing'].startswith('summary;')
+
+    assert client.get(f'/statistics/panels/summary?court_id={court.id}').headers['X-Cache'] == 'HIT'
+    for panel in ('trends', 'status_changes', 'courts', 'durations', 'users', 'activities'):
+        assert client.get(f'/statistics/panels/{panel}').get_json()['success']
+
+    assert client.get('/statistics/panels/unknown').status_code == 404
+    assert client.get('/statistics/panels/summary?start_date=2024-13-01').status_code == 400
+
+
+def test_single_flight(app, init_database):
+    """
+    GIVEN several concurrent requests for the same expensive computation
+    WHEN they go through single_flight
+    THEN check the computation runs once and its stored result is shared with other workers
+    """
+    import threading
+    import time
+    from datetime import datetime, timedelta
+    from app.models.models import ComputationLock
+    from app.utils.cache import cache, invalidate_court
+    from app.utils.single_flight import flight_key, single_flight
+
+    key = flight_key('test.report', court_id=None, end_date=None, start_date=date(2024, 1, 1))
+    assert key == 'test.report?start_date=2024-01-01'
+
+    calls = []
+    started, release = threading.Event(), threading.Event()
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {'total': 42}
+
+    results = []
+
+    def request_report():
+        with app.app_context():
+            results.append(single_flight(key, compute, ttl=60))
+
+    threads = [threading.Thread(target=request_report) for _ in range(4)]
+    threads[0].start()
+    assert started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert [value for value, _ in results] == [{'total': 42}] * 4
+    assert sorted(source for _, source in results)[0] == 'computed'
+    assert single_flight(key, compute, ttl=60) == ({'total': 42}, 'cache')
+
+    # A worker without the result in its memory reads the one stored by the first
+    cache.clear()
+    assert single_flight(key, compute, ttl=60) == ({'total': 42}, 'shared')
+    assert len(calls) == 1
+
+    # Results spanning all courts are recomputed once any court changed
+    release.set()
+    invalidate_court(1)
+    assert single_flight(key, compute, ttl=60) == ({'total': 42}, 'computed')
+    assert len(calls) == 2
+
+    # A lock held past the timeout does not block the computation for good
+    db.session.add(ComputationLock(
+        key='test.stuck', owner='other-worker', locked_until=datetime.utcnow() + timedelta(minutes=5)
+    ))
+    db.session.commit()
+    app.config['SINGLE_FLIGHT_TIMEOUT'] = 0.3
+    try:
+        assert single_flight('test.stuck', lambda: [1], ttl=60) == ([1], 'computed')
+    finally:
+        app.config['SINGLE_FLIGHT_TIMEOUT'] = 120
+
+
+def test_courts_pages_count_from_rollup(client, init_database):
+    """
+    GIVEN a court with cases in several statuses
+    WHEN the court list and court details pages are rendered
+    THEN check the per-status counts are shown without selecting case rows
+    """
+    from sqlalchemy import event
+    from app.models.models import Court
+
+    login(client)
+    court = Court(name='Counted Court')
+    db.session.add(court)
+    db.session.commit()
+    db.session.add_all([
+        Case(case_number='1/9066', c_order=1, court_id=court.id, status=CaseStatus.active),
+        Case(case_number='2/9066', c_order=2, court_id=court.id, status=CaseStatus.active),
+        Case(case_number='3/9066', c_order=3, court_id=court.id, status=CaseStatus.finished),
+    ])
+    db.session.commit()
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        html = client.get('/courts').get_data(as_text=True)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+    assert not [s for s in statements if 'FROM tblcase ' in s or s.rstrip().endswith('FROM tblcase')]
+    assert 'نشطة: 2' in html and 'منتهية: 1' in html
+
+    response = client.get(f'/view_court_details/{court.id}')
+    assert response.status_code == 200
+    assert '<h4>3</h4>' in response.get_data(as_text=True)
+
+
+def test_control_summary(client, init_database):
+    """
+    GIVEN known cases and users added to the existing ones
+    WHEN the admin control page is rendered
+    THEN check its counts grow by exactly those rows and only the recent slice is listed
+    """
+    from app.models.models import Court, User
+    from app.utils.dashboards import CONTROL_RECENT_LIMIT, control_summary
+
+    before = control_summary()
+    court = Court(name='Control Court')
+    db.session.add(court)
+    db.session.commit()
+    statuses = [CaseStatus.active, CaseStatus.active, CaseStatus.finished] + [CaseStatus.inactive] * CONTROL_RECENT_LIMIT
+    cases = [
+        Case(case_number=f'{n}/9049', c_order=n, court_id=court.id, status=status)
+        for n, status in enumerate(statuses, start=1)
+    ]
+    clerk = User(username='clerk9049', password='x', name='Clerk', email='clerk9049@example.com',
+                 tel='0', court_id=court.id)
+    db.session.add_all(cases + [clerk])
+    db.session.commit()
+
+    summary = control_summary()
+    assert summary['total_cases'] == before['total_cases'] + len(statuses)
+    assert summary['active_cases'] == before['active_cases'] + 2
+    assert summary['total_users'] == before['total_users'] + 1
+    assert summary['admin_users'] == before['admin_users']
+    assert [case['id'] for case in summary['recent_cases']] == [case.id for case in cases[::-1][:CONTROL_RECENT_LIMIT]]
+    assert summary['recent_users'][0]['username'] == 'clerk9049'
+
+    login(client)
+    for url in ('/', '/control'):
+        html = client.get(url).get_data(as_text=True)
+        assert f"<h2>{summary['total_cases']}</h2>" in html
+
+
+def test_court_cases_keyset_pages(client, init_database):
+    """
+    GIVEN a court with cases, some without a case date
+    WHEN its cases are listed page by page in every sort order
+    THEN check the pages join up without gaps or repeats and invalid cursors fall back to the first page
+    """
+    from app.models.models import Court
+    from app.utils.read_models import CASE_PAGE_SORTS, case_list_page
+
+    court = Court(name='Paged Court')
+    db.session.add(court)
+    db.session.commit()
+    db.session.add_all([
+        Case(
+            case_number=f'{n}/2024', c_order=n, court_id=court.id,
+            case_date=date(2024, 1, 1 + n % 3) if n % 4 else None, status=CaseStatus.active
+        )
+        for n in range(1, 12)
+    ])
+    db.session.commit()
+
+    for sort in CASE_PAGE_SORTS:
+        query = Case.query.filter_by(court_id=court.id)
+        expected = [row.id for row in case_list_page(query, sort, limit=100)[0]]
+        seen, cursor = [], None
+        while True:
+            rows, cursor = case_list_page(Case.query.filter_by(court_id=court.id), sort, cursor, limit=4)
+            seen += [row.id for row in rows]
+            if not cursor:
+                break
+        assert seen == expected and len(seen) == 11, sort
+
+    login(client)
+    response = client.get(f'/court_cases/{court.id}?per_page=4&order=number')
+    html = response.get_data(as_text=True)
+    assert 'إجمالي 11 قضية' in html and 'cursor=' in html
+    assert '>1/2024<' in html and '>5/2024<' not in html
+    response = client.get(f'/court_cases/{court.id}?cursor=not-a-cursor')
+    assert response.status_code == 200 and 'Invalid page link' in response.get_data(as_text=True)
+
+
+def test_case_writes_drop_stored_cause_lists(app, init_database):
+    """
+    GIVEN stored cause lists of a court for a past day and for today
+    WHEN the court's cases change
+    THEN check today's list is dropped and rebuilt with the change, and the past one is kept,
+         while display board changes keep every list
+    """
+    from app.models.models import CauseList
+    from app.utils.cache import invalidate_court
+    from app.utils.cause_lists import get_cause_list
+
+    today = date.today()
+    get_cause_list(1, date(2026, 3, 5))
+    assert get_cause_list(1, today).case_count == 0
+    invalidate_court(1, cause_lists=False)
+    assert CauseList.query.filter_by(court_id=1, list_date=today).first() is not None
+
+    db.session.add(Case(case_number='1/9077', c_order=9077, court_id=1, next_session_date=today.isoformat()))
+    db.session.commit()
+    invalidate_court(1)
+
+    assert CauseList.query.filter_by(court_id=1, list_date=today).first() is None
+    assert CauseList.query.filter_by(court_id=1, list_date=date(2026, 3, 5)).first() is not None
+    assert get_cause_list(1, today).case_count == 1
@@ -42,3 +42,16 @@ def test_new_case(init_database):
     )
     assert case.case_number == '123/2023'
     assert case.status == CaseStatus.active
+
+def test_case_number_parts(init_database):
+    """
+    GIVEN a Case model
+    WHEN the case number is set or changed
+    THEN check that the prefix, serial and year columns follow it
+    """
+    case = Case(case_number='170/7103/2021', c_order=1, court_id=1)
+    assert (case.case_prefix, case.case_serial, case.case_year) == ('7103', 170, 2021)
+    case.case_number = 'س/55/2023'
+    assert (case.case_prefix, case.case_serial, case.case_year) == ('س', 55, 2023)
+    case.case_number = '1234/2024'
+    assert (case.case_prefix, case.case_serial, case.case_year) == (None, 1234, 2024)